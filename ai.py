@@ -13,7 +13,7 @@ from tensorflow.keras.callbacks import EarlyStopping, ModelCheckpoint, CSVLogger
 import os
 from argparse import ArgumentParser, Namespace, ArgumentTypeError
 from datetime import datetime
-from typing import Iterator, Tuple
+from typing import Iterable, Iterator, Tuple
 
 
 MODEL_DIR = 'models'
@@ -220,6 +220,21 @@ def predict(
     return y_pred.numpy()[0][0]
 
 
+def predict_batch(
+    model: Sequential,
+    id_map: str,
+    points: Iterable[Tuple[float, float, float, float]]
+) -> np.ndarray:
+    """Batched version of `predict`, with one `(start_x, start_y, target_x, target_y)` row
+    per prediction, so the model is called once for all of them.
+    Return an array with one prediction per row
+    """
+    X = np.array([(0.0, *point) for point in points], dtype=np.float64).reshape(-1, 5)
+    X[:, 0] = convert_s2f(id_map)
+    y_pred = model(tf.convert_to_tensor(X, dtype=tf.float64), training=False)
+    return y_pred.numpy()[:, 0]
+
+
 def parser() -> Namespace:
     def restricted_float(x: str) -> float:
         try:
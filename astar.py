@@ -1,6 +1,6 @@
 from bitpacked_grid_expansion_policy import BitpackedGridExpansionPolicy
 from point import Point2D
-from fibonacci_heap import FibonacciHeap
+from binary_heap import BinaryHeap
 from search import SearchNode
 from path import Path
 from constants import EPSILON
@@ -14,7 +14,6 @@ class AStar:
 
     """
     
-    search_id_counter = 0
     VERBOSE = False
         
     def __init__(
@@ -24,14 +23,15 @@ class AStar:
         id_map: Optional[str]
     ):
         self.roots_: Dict[int, SearchNode] = {}
-        self.open = FibonacciHeap()
+        self.h_values_: Dict[int, float] = {}
+        self.search_id_counter = 0
+        self.open = BinaryHeap()
         self._heuristic = expander.heuristic
         self._expander = expander
         self.mb_start = None
         self.mb_target = None
-        if model_path is not None:
-            self.model = _load_model(model_path)
-            self.id_map = id_map
+        self.model = _load_model(model_path) if model_path is not None else None
+        self.id_map = id_map
 
     @property
     def expander(self) -> BitpackedGridExpansionPolicy:
@@ -39,31 +39,35 @@ class AStar:
         return self._expander
 
     def init(self) -> None:
-        AStar.search_id_counter += 1
+        self.search_id_counter += 1
         self.expanded = 0
         self.insertions = 0
         self.generated = 0
         self.heap_ops = 0
         self.open.clear()
         self.roots_.clear()
+        self.h_values_.clear()
         self.path_found = False
+        self.goal_node_: Optional[SearchNode] = None
 
     def print_path(self, current: SearchNode) -> None:
-        if current.parent is not None:
-            self.print_path(current.parent)
-        print(f'{current.data}; g={current.secondary_key}')
+        nodes = []
+        while current is not None:
+            nodes.append(current)
+            current = current.parent
+        for node in reversed(nodes):
+            print(f'{node.data}; g={node.secondary_key}')
 
     def search(self, start: Point2D, target: Point2D) -> Path:
         cost = self.search_costonly(start, target)
-        # generate the path
-        path = Path() 
+        # generate the path, walking back from the search node of the target
+        path = Path()
         if cost != -1:
-            node = self.generate(target)
-            while True:
-                path = Path(node.data, path, node.secondary_key)
-                if node.parent is None:
-                    break
+            node = self.goal_node_
+            while node is not None:
+                path.append(node.data, node.secondary_key)
                 node = node.parent
+            path.reverse()
         return path
 
     def search_costonly(self, start: Point2D, target: Point2D) -> float:
@@ -72,46 +76,72 @@ class AStar:
         if not self._expander.validate_instance(start, target):
             return cost
         
-        start_node = self.generate(start)
-        start_node.reset_(AStar.search_id_counter)
+        start_node = self.generate(start, self.search_id_counter)
 
-        if hasattr(self, 'model'):
+        # resolved once; the model doesn't change during a search
+        use_model = self.model is not None
+        if use_model:
             value = predict(self.model, self.id_map, *start, *target)
         else:
             value = self._heuristic.get_value(start, target)
         self.open.insert(start_node, value, 0)
 
-        while not self.open.is_empty():
-            current: SearchNode = self.open.remove_min()
-
-            if self.VERBOSE:
+        # bind everything the loop touches per node to locals;
+        # counters are written back once the search is over
+        verbose = self.VERBOSE
+        search_id = self.search_id_counter
+        model = self.model
+        id_map = self.id_map
+        open_list = self.open
+        open_insert = open_list.insert
+        open_remove_min = open_list.remove_min
+        roots = self.roots_
+        roots_get = roots.get
+        # a vertex is often inserted again on a tie or a better path; its estimate doesn't change
+        h_values = self.h_values_
+        h_values_get = h_values.get
+        expander = self._expander
+        expander_expand = expander.expand
+        expander_has_next = expander.has_next
+        expander_next = expander.next
+        expander_hash = expander.hash
+        expander_step_cost = expander.step_cost
+        get_value = self._heuristic.get_value
+        expanded = heap_ops = insertions = generated = 0
+
+        while not open_list.is_empty():
+            current: SearchNode = open_remove_min()
+
+            if verbose:
                 print(f'expanding (f={current.key}) {current}')
             
-            self._expander.expand(current.data)
-            self.expanded += 1
-            self.heap_ops += 1
+            expander_expand(current.data)
+            expanded += 1
+            heap_ops += 1
 
             if current.data == target:
                 # found the goal
                 cost = current.key
                 self.path_found = True
+                self.goal_node_ = current
 
-                if self.VERBOSE:
+                if verbose:
                     self.print_path(current)
                 break
             
             # unique id for the root of the parent node
-            p_hash = self._expander.hash(current.data)
+            p_hash = expander_hash(current.data)
+            current_g = current.secondary_key
 
             # iterate over all neighbours
-            while self._expander.has_next():
-                n = self._expander.next()
-                neighbour = self.generate(n)
+            while expander_has_next():
+                n = expander_next()
+                generated += 1
 
                 insert = True
-                root_hash = self._expander.hash(n)
-                root_rep = self.roots_.get(root_hash, None)
-                new_g_value = current.secondary_key + self._expander.step_cost()
+                root_hash = expander_hash(n)
+                root_rep = roots_get(root_hash, None)
+                new_g_value = current_g + expander_step_cost()
 
                 """Root level pruning:
                 We prune a node if its g-value is larger than the best
@@ -127,47 +157,55 @@ class AStar:
                     while updating its g-value in the root history.
                     If it doesn't, we discard the node
                     """
-                    root_best_g = root_rep.secondary_key
-                    insert = (new_g_value - root_best_g) <= EPSILON
-                    eq = (new_g_value - root_best_g) >= -EPSILON
-                    if insert and eq and root_rep.parent is not None:
-                        p_rep_hash = self._expander.hash(root_rep.parent.data)
+                    g_diff = new_g_value - root_rep.secondary_key
+                    insert = g_diff <= EPSILON
+                    # on a tie (|g_diff| <= EPSILON), only siblings or children of the best node
+                    if insert and g_diff >= -EPSILON and root_rep.parent is not None:
+                        p_rep_hash = expander_hash(root_rep.parent.data)
                         insert = (root_hash == p_hash) or (p_rep_hash == p_hash)
 
                 if insert:
-                    neighbour.reset_(AStar.search_id_counter)
+                    # created only now, already stamped for this search
+                    neighbour = SearchNode(n, search_id)
                     neighbour.parent = current
 
-                    if hasattr(self, 'model'):
-                        value = predict(self.model, self.id_map,
-                                        *neighbour.data, *target)
-                    else:
-                        value = self._heuristic.get_value(neighbour.data, target)
+                    value = h_values_get(root_hash)
+                    if value is None:
+                        if use_model:
+                            value = predict(model, id_map, *n, *target)
+                        else:
+                            value = get_value(n, target)
+                        h_values[root_hash] = value
 
-                    self.open.insert(
+                    open_insert(
                         neighbour,
                         new_g_value + value,
                         new_g_value
                     )
-                    self.roots_[root_hash] = neighbour
+                    roots[root_hash] = neighbour
 
-                    if self.VERBOSE:
+                    if verbose:
                         print(f'\tinserting with f={neighbour.key} (g={new_g_value}) {neighbour}')
 
-                    self.heap_ops += 1
-                    self.insertions += 1
+                    heap_ops += 1
+                    insertions += 1
 
                 else:
-                    if self.VERBOSE:
+                    if verbose:
                         print(f'\told rootg: {root_rep.secondary_key}')
-                        print(f'\tNOT inserting with f={neighbour.key} (g={new_g_value}) {neighbour}')
+                        print(f'\tNOT inserting with g={new_g_value} {n}')
+
+        self.expanded = expanded
+        self.generated += generated
+        self.heap_ops = heap_ops
+        self.insertions = insertions
 
         if self.VERBOSE:
             print('finishing search;')
         return cost
     
-    def generate(self, v: Point2D) -> SearchNode:
-        retval = SearchNode(v)
+    def generate(self, v: Point2D, search_id: int = -1) -> SearchNode:
+        retval = SearchNode(v, search_id)
         self.generated += 1
         return retval
     
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from heapq import heappush, heappop
+from itertools import count
+from fibonacci_heap_node import FibonacciHeapNode
+from typing import List, Optional, Tuple
+
+
+class BinaryHeap:
+    """Array-backed binary min-heap used as the open list of the searches.
+    It orders nodes exactly like `FibonacciHeapNode.less_than`: keys are compared
+    at 1/BIG_ONE resolution and ties go to the larger secondary key. Remaining ties
+    go to the most recently inserted node, so searches are deterministic.
+    The sift operations run in `heapq`'s C implementation over a flat list,
+    which is much cheaper than linking and consolidating Fibonacci trees.
+    There is no decrease-key; searches insert a node again instead
+
+    Attributes
+    ----------
+    _entries : List[Tuple[int, int, int, FibonacciHeapNode]]
+        Heap-ordered entries of scaled key, negated scaled secondary key,
+        negated insertion number and node
+    _counter : count
+        Insertion numbers for tie-breaking
+
+    """
+
+    __slots__ = ('_entries', '_counter')
+
+    def __init__(self):
+        self._entries: List[Tuple[int, int, int, FibonacciHeapNode]] = []
+        self._counter = count()
+
+    @property
+    def n_nodes(self) -> int:
+        """Number of nodes in the heap"""
+        return len(self._entries)
+
+    @property
+    def min_node(self) -> Optional[FibonacciHeapNode]:
+        """Node with the minimum key, None if the heap is empty"""
+        return self._entries[0][3] if self._entries else None
+
+    def is_empty(self) -> bool:
+        """Return True if the heap has no nodes"""
+        return not self._entries
+
+    def clear(self) -> None:
+        """Remove all nodes from the heap"""
+        self._entries.clear()
+        self._counter = count()
+
+    def insert(
+        self,
+        node: FibonacciHeapNode,
+        key: float,
+        secondary_key: float = 0
+    ) -> None:
+        """Insert `node` with priority `key`, breaking ties by `secondary_key`"""
+        node.key = key
+        node.secondary_key = secondary_key
+        big_one = FibonacciHeapNode.BIG_ONE
+        heappush(self._entries, (int(key * big_one + 0.5), -int(secondary_key * big_one + 0.5),
+                                 -next(self._counter), node))
+
+    def remove_min(self) -> Optional[FibonacciHeapNode]:
+        """Remove and return the node with the minimum key, None if the heap is empty"""
+        if not self._entries:
+            return None
+        return heappop(self._entries)[3]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        """Debug representation of the heap"""
+        return f'BinaryHeap={[entry[3] for entry in self._entries]}'
@@ -2,14 +2,29 @@ from grid import BitpackedGrid
 from heuristic import HackyHeuristic
 from point import Point2D
 from constants import ROOT_TWO
-from typing import Optional
+from typing import List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise Exception('Unable to import numpy, make sure you have it installed')
 
 
 class BitpackedGridExpansionPolicy:
+    # bits of a point's mask, set when the adjacent cell is traversable
+    CELL_NE = 1
+    CELL_SE = 2
+    CELL_NW = 4
+    CELL_SW = 8
+    DOUBLE_CORNER_MASKS = (CELL_NE | CELL_SW, CELL_NW | CELL_SE)
+
     def __init__(self, file_name: str):
         self._grid = BitpackedGrid(map_file=file_name)
-        self._neis = [None] * 8
-        self._step_costs = [None] * 8
+        self._map_width = self._grid.map_width
+        self._neis = []
+        self._step_costs = ()
+        self._num_neis = 0
+        self._index = 0
         self._h = HackyHeuristic()
 
         self._pool = [None] * self._grid.num_cells
@@ -17,6 +32,21 @@ class BitpackedGridExpansionPolicy:
             for x in range(self._grid.map_width):
                 self._pool[self.compute_id(x, y)] = Point2D(x, y)
 
+        # the grid is static, so which cells surround each point is read once into
+        # a mask per point id, and the moves of every mask are tabulated
+        width = self._grid.map_width_original
+        height = self._grid.map_height_original
+        xs = np.arange(-1, width + 1)
+        cells = np.array([self._grid.get_cells_are_traversable_bulk(xs, y)
+                          for y in range(-1, height + 1)], dtype=np.uint8)
+        masks = np.zeros((self._grid.map_height, self._grid.map_width), dtype=np.uint8)
+        masks[:height + 1, :width + 1] = (cells[:-1, 1:] * self.CELL_NE | cells[1:, 1:] * self.CELL_SE |
+                                          cells[:-1, :-1] * self.CELL_NW | cells[1:, :-1] * self.CELL_SW)
+        self._cell_masks = masks.tobytes()
+
+        self._moves = [self.tabulate_moves(mask, False) for mask in range(16)]
+        self._start_double_corner_moves = [self.tabulate_moves(mask, True) for mask in range(16)]
+
     @property
     def heuristic(self) -> HackyHeuristic:
         """Get heuristic used for this policy instance"""
@@ -30,85 +60,45 @@ class BitpackedGridExpansionPolicy:
         return (self._grid.get_cell_is_traversable(*self._s) and 
                 self._grid.get_cell_is_traversable(*self._t))
 
-    def expand_start_is_valid_double_corner(self, v: Point2D) -> None:
-        se = self._grid.get_cell_is_traversable(v.x, v.y)
-        sw = self._grid.get_cell_is_traversable(v.x - 1, v.y)
-        nw = self._grid.get_cell_is_traversable(v.x - 1, v.y - 1)
-        ne = self._grid.get_cell_is_traversable(v.x, v.y - 1)
-
-        # add diagonals
-        if se:
-            self._step_costs[self._num_neis] = ROOT_TWO
-            self._neis[self._num_neis] = self._pool[self.compute_id(v.x + 1, v.y + 1)]
-            self._num_neis += 1
-
-        # add cardinals  (east and south only)
-        if ne or se:
-            self._step_costs[self._num_neis] = 1.0
-            self._neis[self._num_neis] = self._pool[self.compute_id(v.x + 1, v.y)]
-            self._num_neis += 1
-
-        if se or sw:
-            self._step_costs[self._num_neis] = 1.0
-            self._neis[self._num_neis] = self._pool[self.compute_id(v.x, v.y + 1)]
-            self._num_neis += 1
-
     def expand(self, v: Point2D) -> None:
         """Expand all neighbors of a point"""
-        self._num_neis = 0
+        vid = v.y * self._map_width + v.x
+        mask = self._cell_masks[vid]
+        if mask in self.DOUBLE_CORNER_MASKS and v.x == self._s.x and v.y == self._s.y:
+            deltas, self._step_costs = self._start_double_corner_moves[mask]
+        else:
+            deltas, self._step_costs = self._moves[mask]
+
+        pool = self._pool
+        self._neis = [pool[vid + delta] for delta in deltas]
+        self._num_neis = len(deltas)
         self._index = 0
-        
-        if self._grid.get_point_is_double_corner(v.x, v.y):
-            if v.x == self._s.x and v.y == self._s.y:
-                self.expand_start_is_valid_double_corner(v)
-            return
-
-        se = self._grid.get_cell_is_traversable(v.x, v.y)
-        sw = self._grid.get_cell_is_traversable(v.x - 1, v.y)
-        nw = self._grid.get_cell_is_traversable(v.x - 1, v.y - 1)
-        ne = self._grid.get_cell_is_traversable(v.x, v.y - 1)
-
-        # add diagonals
-        if ne:
-            self._step_costs[self._num_neis] = ROOT_TWO
-            self._neis[self._num_neis] = self._pool[self.compute_id(v.x + 1, v.y - 1)]
-            self._num_neis += 1
-
-        if se:
-            self._step_costs[self._num_neis] = ROOT_TWO
-            self._neis[self._num_neis] = self._pool[self.compute_id(v.x + 1, v.y + 1)]
-            self._num_neis += 1
-
-        if nw:
-            self._step_costs[self._num_neis] = ROOT_TWO
-            self._neis[self._num_neis] = self._pool[self.compute_id(v.x - 1, v.y - 1)]
-            self._num_neis += 1
-
-        if sw:
-            self._step_costs[self._num_neis] = ROOT_TWO
-            self._neis[self._num_neis] = self._pool[self.compute_id(v.x - 1, v.y + 1)]
-            self._num_neis += 1
-
-        # add cardinals
-        if ne or se:
-            self._step_costs[self._num_neis] = 1.0
-            self._neis[self._num_neis] = self._pool[self.compute_id(v.x + 1, v.y)]
-            self._num_neis += 1
-
-        if nw or sw:
-            self._step_costs[self._num_neis] = 1.0
-            self._neis[self._num_neis] = self._pool[self.compute_id(v.x - 1, v.y)]
-            self._num_neis += 1
-
-        if ne or nw:
-            self._step_costs[self._num_neis] = 1.0
-            self._neis[self._num_neis] = self._pool[self.compute_id(v.x, v.y - 1)]
-            self._num_neis += 1
-
-        if se or sw:
-            self._step_costs[self._num_neis] = 1.0
-            self._neis[self._num_neis] = self._pool[self.compute_id(v.x, v.y + 1)]
-            self._num_neis += 1
+
+    @staticmethod
+    def point_moves(mask: int, start_double_corner: bool) -> List[Tuple[int, int, float]]:
+        """Moves `(dx, dy, step cost)` out of a point whose adjacent traversable cells are `mask`.
+        Double corners have no moves, except for the start which may still move east and south
+        """
+        ne = bool(mask & BitpackedGridExpansionPolicy.CELL_NE)
+        se = bool(mask & BitpackedGridExpansionPolicy.CELL_SE)
+        nw = bool(mask & BitpackedGridExpansionPolicy.CELL_NW)
+        sw = bool(mask & BitpackedGridExpansionPolicy.CELL_SW)
+
+        if mask in BitpackedGridExpansionPolicy.DOUBLE_CORNER_MASKS:
+            if not start_double_corner:
+                return []
+            # diagonal and cardinals east and south only
+            candidates = [(se, 1, 1, ROOT_TWO), (ne or se, 1, 0, 1.0), (se or sw, 0, 1, 1.0)]
+        else:
+            candidates = [
+                # diagonals
+                (ne, 1, -1, ROOT_TWO), (se, 1, 1, ROOT_TWO),
+                (nw, -1, -1, ROOT_TWO), (sw, -1, 1, ROOT_TWO),
+                # cardinals
+                (ne or se, 1, 0, 1.0), (nw or sw, -1, 0, 1.0),
+                (ne or nw, 0, -1, 1.0), (se or sw, 0, 1, 1.0)
+            ]
+        return [(dx, dy, cost) for allowed, dx, dy, cost in candidates if allowed]
 
     def next(self) -> Optional[Point2D]:
         """Get next neighbor, if one exists, of the point being expanded"""
@@ -137,3 +127,13 @@ class BitpackedGridExpansionPolicy:
 
     def hash(self, v: Point2D) -> int:
         return self.compute_id(v.x, v.y)
+
+    def tabulate_moves(
+        self,
+        mask: int,
+        start_double_corner: bool
+    ) -> Tuple[Tuple[int, ...], Tuple[float, ...]]:
+        """Point id offsets and step costs of the moves out of a point with `mask`"""
+        moves = self.point_moves(mask, start_double_corner)
+        return (tuple(dy * self._map_width + dx for dx, dy, _ in moves),
+                tuple(cost for _, _, cost in moves))
@@ -6,4 +6,6 @@ PADDING_ = 2
 BITS_PER_WORD = 32
 LOG2_BITS_PER_WORD = 5
 INDEX_MASK = BITS_PER_WORD - 1
-ROOT_TWO = 1.4142135381698608
\ No newline at end of file
+ROOT_TWO = 1.4142135381698608
+# check argument invariants on the search hot paths; off by default as they run per node
+DEBUG = False
@@ -1,10 +1,11 @@
 from grid import BitpackedGrid
-from heuristic import Heuristic, EuclideanDistanceHeuristic
+from heuristic import Heuristic
 from node import Node
 from interval_projection import IntervalProjection
 from interval import Interval
-from constants import EPSILON
-from typing import List, Optional
+from constants import EPSILON, DEBUG
+from math import hypot
+from typing import Dict, List, Optional, Tuple
 
 
 class ExpansionPolicy:
@@ -20,8 +21,6 @@ class ExpansionPolicy:
         List of successors of the node currently being expanded
     _heuristic : Heuristic
         Heuristic to evaluate movement costs from a given node to another
-    _euclidean : EuclideanDistanceHeuristic
-        Heuristic to calculate distance between points
     _start : Node
         Start node when starting a new search
     _target : Node
@@ -36,6 +35,14 @@ class ExpansionPolicy:
         Next successor helper
     _cnode : Node
         Current node that is being expanded
+    _projection : IntervalProjection
+        Projection of the node currently being expanded, reused across expansions
+    _flat_projection : IntervalProjection
+        Projection of flat non-observable successors, reused across expansions
+    _split_projection : IntervalProjection
+        Projection further along the row of intermediate cone successors, reused across expansions
+    _intervals : Dict[Tuple[float, float, int], Interval]
+        Successor intervals shared through `Interval.get` during the current search
 
     """
 
@@ -48,7 +55,10 @@ class ExpansionPolicy:
         self._prune = prune
         self._successors: List[Node] = []
         self._heuristic = Heuristic()
-        self._euclidean = EuclideanDistanceHeuristic()
+        self._projection = IntervalProjection()
+        self._flat_projection = IntervalProjection()
+        self._split_projection = IntervalProjection()
+        self._intervals: Dict[Tuple[float, float, int], Interval] = {}
 
     @property
     def heuristic(self) -> Heuristic:
@@ -59,6 +69,11 @@ class ExpansionPolicy:
     def grid(self) -> BitpackedGrid:
         """Get current searching grid"""
         return self._grid
+
+    @property
+    def successors(self) -> List[Node]:
+        """Get successors of the node currently being expanded"""
+        return self._successors
     
     def validate_instance(self, start: Node, target: Node) -> bool:
         """Validate start and target nodes when starting a new search instance"""
@@ -66,6 +81,8 @@ class ExpansionPolicy:
         self._target = target
         self._tx = self._target.root.x
         self._ty = self._target.root.y
+        # successors of the previous search are no longer referenced
+        self._intervals.clear()
 
         return (self._grid.get_cell_is_traversable(int(start.root.x), int(start.root.y)) and 
                 self._grid.get_cell_is_traversable(int(target.root.x), int(target.root.y)))
@@ -96,18 +113,21 @@ class ExpansionPolicy:
 
     def step_cost(self) -> float:
         """Get Euclidean distance between the node that's being expanded and next neighbor"""
-        assert self._cnode is not None and self._csucc is not None, \
-            ('Node under expansion and/or next successor node are/is None. '
-             f'Got: {type(self._cnode)} and {type(self._csucc)}')
+        if DEBUG:
+            assert self._cnode is not None and self._csucc is not None, \
+                ('Node under expansion and/or next successor node are/is None. '
+                 f'Got: {type(self._cnode)} and {type(self._csucc)}')
         
-        return self._euclidean.h(*self._cnode.root, *self._csucc.root)
+        cnode_root = self._cnode.root
+        csucc_root = self._csucc.root
+        return hypot(cnode_root.x - csucc_root.x, cnode_root.y - csucc_root.y)
 
     def generate_successors(self, node: Node, retval: List[Node]) -> None:
         """Generate observable and non-observable flat and cone successors 
         of a given node based on its Y coordinate.
         Project node's interval onto the next row
         """
-        projection = IntervalProjection()
+        projection = self._projection
 
         if node.root.y == node.interval.row:
             projection.project(node, self._grid)
@@ -128,11 +148,12 @@ class ExpansionPolicy:
         - conical observable successors below;
         - conical observable successors above
         """
-        assert (node.interval.left == node.interval.right and
-                node.interval.left == node.root.x and
-                node.interval.row == node.root.y), \
-                    ('Off-grid node\'s interval must contain only that node. '
-                     'Expected row == y; left == right == x')
+        if DEBUG:
+            assert (node.interval.left == node.interval.right and
+                    node.interval.left == node.root.x and
+                    node.interval.row == node.root.y), \
+                        ('Off-grid node\'s interval must contain only that node. '
+                         'Expected row == y; left == right == x')
 
         rootx = int(node.root.x)
         rooty = int(node.root.y)
@@ -146,16 +167,16 @@ class ExpansionPolicy:
             
         # generate flat observable successors left of the start point
         # NB: hacky implementation; we use a fake root for the projection
-        projection = IntervalProjection()
+        projection = self._projection
         if not start_dc:
-            projection.project(rootx, rootx, rooty,
-                                rootx + 1, rooty, self._grid)
+            projection.project_interval(rootx, rootx, rooty,
+                                        rootx + 1, rooty, self._grid)
             self.generate_observable_flat__(projection, rootx, rooty, node, retval)
 
         # generate flat observable successors right of the start point
         # NB: hacky implementation; we use a fake root for the projection
-        projection.project(rootx, rootx, rooty,
-                            rootx - 1, rooty, self._grid)
+        projection.project_interval(rootx, rootx, rooty,
+                                    rootx - 1, rooty, self._grid)
         self.generate_observable_flat__(projection, rootx, rooty, node, retval)
 
         # generate conical observable successors below the start point
@@ -209,10 +230,10 @@ class ExpansionPolicy:
             succ_left = self._grid.scan_left(succ_right, irow)
             if forced_succ or not self.sterile(succ_left, succ_right, sterile_check_row):
                 successor = Node.from_points(
-                    Interval(succ_left, succ_right, irow), rootx, rooty, parent
+                    Interval.get(max_left if succ_left < max_left else succ_left, succ_right, irow,
+                                 self._intervals),
+                    rootx, rooty, parent
                 )
-                
-                successor.interval.left = max_left if succ_left < max_left else succ_left
                 retval.append(successor)
 
             if not ((succ_left != succ_right) and (succ_left > max_left)):
@@ -224,7 +245,8 @@ class ExpansionPolicy:
 
             del retval[-1]
 
-            proj = IntervalProjection()
+            # recursion only starts once this projection has been read
+            proj = self._split_projection
             proj.project_cone(successor.interval.left, successor.interval.right, 
                               successor.interval.row, rootx, rooty, self._grid)
             if proj.valid and proj.observable:
@@ -298,9 +320,10 @@ class ExpansionPolicy:
         """There is an inductive argument here: if the move is not valid
         the node should have been pruned. check this is always true
         """
-        assert node.root.y != node.interval.row, \
-            ('Node interval and root must not be on the same row. '
-             f'Got {node.root.y} and {node.interval.row}')
+        if DEBUG:
+            assert node.root.y != node.interval.row, \
+                ('Node interval and root must not be on the same row. '
+                 f'Got {node.root.y} and {node.interval.row}')
 
         self.generate_observable_cone__(projection, int(node.root.x), int(node.root.y), node, retval)
 
@@ -337,76 +360,82 @@ class ExpansionPolicy:
         if not projection.valid:
             return
 
-        ileft = node.interval.left
-        iright = node.interval.right
-        irow = int(node.interval.row)
+        grid = self._grid
+        is_traversable = grid.get_cell_is_traversable
+        interval = node.interval
+        ileft = interval.left
+        iright = interval.right
+        irow = int(interval.row)
+        ileft_cell = int(ileft)
+        iright_cell = int(iright)
 
         # non-observable successor type (iii)
         if not projection.observable:
-            if (node.root.x > iright and
-                node.interval.discrete_right and
-                self._grid.get_point_is_corner(int(iright), irow)):
+            rootx = node.root.x
+            if (rootx > iright and
+                interval.discrete_right and
+                grid.get_point_is_corner(iright_cell, irow)):
                 
                 self.split_interval_make_successors(projection.max_left, iright, projection.row,
-                                                    int(iright), irow, projection.sterile_check_row,
+                                                    iright_cell, irow, projection.sterile_check_row,
                                                     node, retval)
 
-            elif (node.root.x < ileft and
-                  node.interval.discrete_left and
-                  self._grid.get_point_is_corner(int(ileft), irow)):
+            elif (rootx < ileft and
+                  interval.discrete_left and
+                  grid.get_point_is_corner(ileft_cell, irow)):
                 self.split_interval_make_successors(ileft, projection.max_right, projection.row,
-                                                    int(ileft), irow, projection.sterile_check_row,
+                                                    ileft_cell, irow, projection.sterile_check_row,
                                                     node, retval)
 
-            if (node.interval.discrete_left and 
-                not self._grid.get_cell_is_traversable(int(ileft) - 1, projection.type_iii_check_row) and 
-                self._grid.get_cell_is_traversable(int(ileft) - 1, projection.check_vis_row)):
+            if (interval.discrete_left and 
+                not is_traversable(ileft_cell - 1, projection.type_iii_check_row) and 
+                is_traversable(ileft_cell - 1, projection.check_vis_row)):
                 # non-observable successors to the left of the current interval
-                projection.project_flat(ileft - self._grid.smallest_step_div2, ileft, 
-                                        int(ileft), int(irow), self._grid)
+                projection.project_flat(ileft - grid.smallest_step_div2, ileft, 
+                                        ileft_cell, irow, grid)
                 
-                self.generate_observable_flat__(projection, int(ileft), irow, node, retval)  	
+                self.generate_observable_flat__(projection, ileft_cell, irow, node, retval)  	
 
-            if (node.interval.discrete_right and 
-                not self._grid.get_cell_is_traversable(int(iright), projection.type_iii_check_row) and 
-                self._grid.get_cell_is_traversable(int(iright), projection.check_vis_row)):
+            if (interval.discrete_right and 
+                not is_traversable(iright_cell, projection.type_iii_check_row) and 
+                is_traversable(iright_cell, projection.check_vis_row)):
                 # non-observable successors to the right of the current interval
-                projection.project_flat(iright, iright + self._grid.smallest_step_div2, 
-                                        int(iright), int(irow), self._grid) # NB: dummy root
+                projection.project_flat(iright, iright + grid.smallest_step_div2, 
+                                        iright_cell, irow, grid) # NB: dummy root
                 
-                self.generate_observable_flat__(projection, int(iright), irow, node, retval) 	   		
+                self.generate_observable_flat__(projection, iright_cell, irow, node, retval) 	   		
             return
 
         # non-observable successors type (i) and (ii)
-        flatprj = IntervalProjection() 	
+        flatprj = self._flat_projection
         corner_row = irow - abs((int(node.root.y) - irow) >> 31)
 
         # non-observable successors to the left of the current interval
-        if node.interval.discrete_left and self._grid.get_point_is_corner(int(ileft), irow):
+        if interval.discrete_left and grid.get_point_is_corner(ileft_cell, irow):
             # flat successors from the interval row
-            if not self._grid.get_cell_is_traversable(int(ileft - 1), corner_row):
-                flatprj.project(ileft - EPSILON, iright, 
-                                 int(irow), int(ileft), int(irow), self._grid)
+            if not is_traversable(int(ileft - 1), corner_row):
+                flatprj.project_interval(ileft - EPSILON, iright, 
+                                         irow, ileft_cell, irow, grid)
                 
-                self.generate_observable_flat__(flatprj, int(ileft), irow, node, retval) 	    				
+                self.generate_observable_flat__(flatprj, ileft_cell, irow, node, retval) 	    				
 
             # conical successors from the projected row
             self.split_interval_make_successors(projection.max_left, projection.left, projection.row, 
-                                                int(ileft), irow, projection.sterile_check_row,
+                                                ileft_cell, irow, projection.sterile_check_row,
                                                 node, retval)
 
         # non-observable successors to the right of the current interval
-        if node.interval.discrete_right and self._grid.get_point_is_corner(int(iright), irow):
+        if interval.discrete_right and grid.get_point_is_corner(iright_cell, irow):
             # flat successors from the interval row
-            if not self._grid.get_cell_is_traversable(int(iright), corner_row):			
-                flatprj.project(ileft, iright + EPSILON, 
-                                 int(irow), int(ileft), int(irow), self._grid)
+            if not is_traversable(iright_cell, corner_row):			
+                flatprj.project_interval(ileft, iright + EPSILON, 
+                                         irow, ileft_cell, irow, grid)
 
-                self.generate_observable_flat__(flatprj, int(iright), irow, node, retval)
+                self.generate_observable_flat__(flatprj, iright_cell, irow, node, retval)
             
             # conical successors from the projected row
             self.split_interval_make_successors(projection.right, projection.max_right, projection.row, 
-                                                int(iright), irow, projection.sterile_check_row, node, retval)
+                                                iright_cell, irow, projection.sterile_check_row, node, retval)
 
     def flat_node_obs(
         self,
@@ -428,8 +457,9 @@ class ExpansionPolicy:
         """Generate observable flat successors by splitting the interval
         projection at each internal corner point
         """
-        assert projection.row == rooty, \
-            f'Projection and root must be on the same row. Got {projection.row} and {rooty}'
+        if DEBUG:
+            assert projection.row == rooty, \
+                f'Projection and root must be on the same row. Got {projection.row} and {rooty}'
         
         if not projection.valid:
             return
@@ -437,8 +467,8 @@ class ExpansionPolicy:
         goal_interval = self.contains_target(projection.left, projection.right, projection.row)
         if projection.intermediate and self._prune and not goal_interval:
             # ignore intermediate nodes and project further along the row
-            projection.project(projection.left, projection.right, projection.row,
-                                rootx, rooty, self._grid)
+            projection.project_interval(projection.left, projection.right, projection.row,
+                                        rootx, rooty, self._grid)
             
             # check if the projection contains the goal
             goal_interval = self.contains_target(projection.left, projection.right, projection.row)
@@ -446,7 +476,7 @@ class ExpansionPolicy:
         if not projection.deadend or not self._prune or goal_interval:
             retval.append(
                 Node.from_points(
-                    Interval(projection.left, projection.right, projection.row), 
+                    Interval.get(projection.left, projection.right, projection.row, self._intervals),
                     rootx,
                     rooty,
                     parent
@@ -36,6 +36,9 @@ class FibonacciHeapNode:
 
     """
 
+    __slots__ = ('data', 'parent', 'child', 'right', 'left', 'key', 'secondary_key',
+                 'degree', 'mark')
+
     BIG_ONE = 100000
     EPSILON = 1 / BIG_ONE
 
@@ -1,13 +1,126 @@
 from __future__ import annotations
 
 from constants import PADDING_, BITS_PER_WORD, LOG2_BITS_PER_WORD, INDEX_MASK
-from fileinput import input
+from jit import njit
+from pathlib import Path
+from typing import List
 
 try:
-    from numpy import zeros, ndarray, uint
+    from numpy import (zeros, full, flatnonzero, frombuffer, packbits, unpackbits, arange, searchsorted,
+                       ndarray, uint8, uint32, int64, iinfo)
 except ImportError as e:
     raise Exception('Unable to import NumPy, make sure you have it installed')
 
+# Kernels below work straight on the packed words of a grid so compiled
+# code (e.g. the projections) can read it without going through `BitpackedGrid`.
+# They follow the scans of `BitpackedGrid` bit for bit, wrap-around included;
+# `map_width` is the padded width and rows must lie within the padding
+
+WORD_MASK = (1 << BITS_PER_WORD) - 1
+
+
+@njit(cache=True)
+def lowest_set_bit(value: int) -> int:
+    """Index of the lowest one-bit of a word, 32 if there is none"""
+    if value == 0:
+        return BITS_PER_WORD
+    index = 0
+    while (value & 1) == 0:
+        value >>= 1
+        index += 1
+    return index
+
+
+@njit(cache=True)
+def highest_set_bit(value: int) -> int:
+    """Index of the highest one-bit of a word, -1 if there is none"""
+    index = -1
+    while value != 0:
+        value >>= 1
+        index += 1
+    return index
+
+
+@njit(cache=True)
+def word_bit_value(words: ndarray[uint32], map_width: int, x: int, y: int) -> bool:
+    """Kernel version of `BitpackedGrid.get_bit_value`"""
+    map_id = (y + PADDING_) * map_width + PADDING_ + x
+    return ((int64(words[map_id >> LOG2_BITS_PER_WORD]) >> (map_id & INDEX_MASK)) & 1) != 0
+
+
+@njit(cache=True)
+def word_scan_cells_right(cells: ndarray[uint32], map_width: int, x: int, y: int) -> int:
+    """Kernel version of `BitpackedGrid.scan_cells_right`"""
+    tile_id = (y + PADDING_) * map_width + PADDING_ + x
+    t_index = tile_id >> LOG2_BITS_PER_WORD
+    obstacles = ~int64(cells[t_index]) & (WORD_MASK << (tile_id & INDEX_MASK)) & WORD_MASK
+    while obstacles == 0:
+        t_index += 1
+        obstacles = ~int64(cells[t_index]) & WORD_MASK
+    return x - tile_id + (t_index << LOG2_BITS_PER_WORD) + lowest_set_bit(obstacles)
+
+
+@njit(cache=True)
+def word_scan_cells_left(cells: ndarray[uint32], map_width: int, x: int, y: int) -> int:
+    """Kernel version of `BitpackedGrid.scan_cells_left`"""
+    tile_id = (y + PADDING_) * map_width + PADDING_ + x
+    t_index = tile_id >> LOG2_BITS_PER_WORD
+    obstacles = ~int64(cells[t_index]) & ((2 << (tile_id & INDEX_MASK)) - 1)
+    while obstacles == 0:
+        t_index -= 1
+        obstacles = ~int64(cells[t_index]) & WORD_MASK
+    return x - tile_id + (t_index << LOG2_BITS_PER_WORD) + highest_set_bit(obstacles)
+
+
+@njit(cache=True)
+def word_scan_right(
+    corners: ndarray[uint32],
+    travel_blocked: ndarray[uint32],
+    map_width: int,
+    smallest_step_div2: float,
+    x: float,
+    row: int
+) -> int:
+    """Kernel version of `BitpackedGrid.scan_right`"""
+    left_of_x = int(x + smallest_step_div2)
+    tile_id = (row + PADDING_) * map_width + PADDING_ + left_of_x
+    t_index = tile_id >> LOG2_BITS_PER_WORD
+    mask = 1 << (tile_id & INDEX_MASK)
+    value = ((int64(corners[t_index]) & ~(mask | (mask - 1))) |
+             (int64(travel_blocked[t_index]) & ~(mask - 1))) & WORD_MASK
+    while value == 0:
+        t_index += 1
+        value = int64(corners[t_index]) | int64(travel_blocked[t_index])
+    return left_of_x - tile_id + (t_index << LOG2_BITS_PER_WORD) + lowest_set_bit(value)
+
+
+@njit(cache=True)
+def word_scan_left(
+    corners: ndarray[uint32],
+    travel_blocked: ndarray[uint32],
+    map_width: int,
+    smallest_step: float,
+    x: float,
+    row: int
+) -> int:
+    """Kernel version of `BitpackedGrid.scan_left`"""
+    left_of_x = int(x)
+    if (x - left_of_x) >= smallest_step and word_bit_value(corners, map_width, left_of_x, row):
+        return left_of_x
+
+    tile_id = (row + PADDING_) * map_width + PADDING_ + left_of_x
+    t_index = tile_id >> LOG2_BITS_PER_WORD
+    mask = (1 << (tile_id & INDEX_MASK)) - 1
+    corner_bits = int64(corners[t_index]) & mask
+    obstacles = int64(travel_blocked[t_index]) & mask
+    while (corner_bits | obstacles) == 0:
+        t_index -= 1
+        corner_bits = int64(corners[t_index])
+        obstacles = int64(travel_blocked[t_index])
+    # stop at a corner but right before an obstacle, as `BitpackedGrid.scan_left` does
+    return (left_of_x - tile_id + (t_index << LOG2_BITS_PER_WORD) +
+            max(highest_set_bit(corner_bits), highest_set_bit(obstacles) + 1))
+
 
 class BitpackedGrid:
     """A grid consists of width x height square cells.
@@ -28,14 +141,20 @@ class BitpackedGrid:
         Map size in words based on padded dimensions
     _map_width_in_words : int
         Map width in words for convenience
-    _map_cells : ndarray[uint]
+    _row_base : List[int]
+        Map id of the first point of each row, padding included.
+        Rows above the grid (negative) wrap around onto the top padding
+    _map_cells : ndarray[uint32]
         Flat array representing map grid cells
-    _visible : ndarray[uint]
+    _visible : ndarray[uint32]
         Array indicating which cell grids are visible and which are not
-    _corner : ndarray[uint]
+    _corner : ndarray[uint32]
         Array indicating which cell grids are corners and which are not
-    _double_corner : ndarray[uint]
+    _double_corner : ndarray[uint32]
         Array indicating which cell grids are double corners and which are not
+    _travel_blocked : ndarray[uint32]
+        Array indicating which points cannot be traveled along their row,
+        i.e. both the cell below and the cell above the point are blocked
     smallest_step : float
         Smallest distance between two adjacent points
     smallest_step_div2 : float
@@ -64,10 +183,14 @@ class BitpackedGrid:
         self._map_height = height + 2 * PADDING_
 
         self._map_size = (self._map_height * self._map_width) >> LOG2_BITS_PER_WORD
-        self._map_cells = zeros(self._map_size, dtype=uint)
-        self._visible = zeros(self._map_size, dtype=uint)
-        self._corner = zeros(self._map_size, dtype=uint)
-        self._double_corner = zeros(self._map_size, dtype=uint)
+        self._row_base = [(y + PADDING_) * self._map_width + PADDING_
+                          for y in [*range(height + PADDING_), *range(-PADDING_, 0)]]
+        self._map_cells = zeros(self._map_size, dtype=uint32)
+        self._visible = zeros(self._map_size, dtype=uint32)
+        self._corner = zeros(self._map_size, dtype=uint32)
+        self._double_corner = zeros(self._map_size, dtype=uint32)
+        # every cell starts blocked so travel is impossible everywhere
+        self._travel_blocked = full(self._map_size, iinfo(uint32).max, dtype=uint32)
 
         self.smallest_step = min(1 / float(self._map_width), 1 / float(self._map_height))
         self.smallest_step_div2 = self.smallest_step / 2.0
@@ -87,6 +210,21 @@ class BitpackedGrid:
         """Get number of cells of the grid"""
         return self._map_height * self._map_width
     
+    @property
+    def map_cells(self) -> ndarray[uint32]:
+        """Get packed words of traversable cells"""
+        return self._map_cells
+
+    @property
+    def corners(self) -> ndarray[uint32]:
+        """Get packed words of corner points"""
+        return self._corner
+
+    @property
+    def travel_blocked(self) -> ndarray[uint32]:
+        """Get packed words of travel blocked points"""
+        return self._travel_blocked
+
     @property
     def map_height_original(self) -> int:
         """Get original map height"""
@@ -146,7 +284,9 @@ class BitpackedGrid:
         self.update_point(cx, cy)
         self.update_point(cx + 1, cy)
         self.update_point(cx, cy + 1)
-        self.update_point(cx + 1, cy + 1)		
+        self.update_point(cx + 1, cy + 1)
+        self.update_travel_blocked(cx, cy)
+        self.update_travel_blocked(cx, cy + 1)
 
     def update_point(self, px: int, py: int) -> None:
         """Set point as visible, corner or double corner
@@ -175,15 +315,64 @@ class BitpackedGrid:
         self.set_point_is_double_corner(px, py, double_corner)
         self.set_point_is_visible(px, py, visible)
 
+    def set_cells_are_traversable(self, cells: ndarray[bool]) -> None:
+        """Set every cell of the grid at once from a `height x width` array
+        of unblocked (True) and blocked (False) cells.
+        Visible, corner, double corner and travel blocked points are derived
+        for the whole grid in bulk, yielding the same bitmaps as calling
+        `set_cell_is_traversable` on each cell
+        """
+        height, width = cells.shape
+        map_width = self._map_width
+        num_cells = self.num_cells
+
+        traversable = zeros(num_cells, dtype=bool)
+        map_ids = ((arange(height) + PADDING_)[:, None] * map_width + (arange(width) + PADDING_)).ravel()
+        traversable[map_ids] = cells.ravel()
+
+        # the four cells adjacent to each point, indexed by the point's map id
+        cell_nw = traversable[:-map_width - 1]
+        cell_ne = traversable[1:-map_width]
+        cell_sw = traversable[map_width:-1]
+        cell_se = traversable[map_width + 1:]
+
+        corner = zeros(num_cells, dtype=bool)
+        corner[map_width + 1:] = (((~cell_nw | ~cell_se) & cell_sw & cell_ne) |
+                                  ((~cell_ne | ~cell_sw) & cell_nw & cell_se))
+
+        double_corner = zeros(num_cells, dtype=bool)
+        double_corner[map_width + 1:] = ((~cell_nw & ~cell_se & cell_sw & cell_ne) ^
+                                         (~cell_sw & ~cell_ne & cell_nw & cell_se))
+
+        visible = zeros(num_cells, dtype=bool)
+        visible[map_width + 1:] = cell_nw | cell_ne | cell_sw | cell_se
+
+        travel_blocked = full(num_cells, True)
+        travel_blocked[map_width:] = ~(traversable[map_width:] | traversable[:-map_width])
+
+        self._map_cells = BitpackedGrid.pack_bits(traversable)
+        self._corner = BitpackedGrid.pack_bits(corner)
+        self._double_corner = BitpackedGrid.pack_bits(double_corner)
+        self._visible = BitpackedGrid.pack_bits(visible)
+        self._travel_blocked = BitpackedGrid.pack_bits(travel_blocked)
+
+    def update_travel_blocked(self, x: int, y: int) -> None:
+        """Set point as travel blocked when neither the cell (x, y)
+        nor the cell above it (x, y - 1) is traversable
+        """
+        blocked = not (self.get_cell_is_traversable(x, y) or
+                       self.get_cell_is_traversable(x, y - 1))
+        self.set_bit_value(x, y, blocked, self._travel_blocked)
+
     def set_bit_value(
         self,
         x: int,
         y: int,
         value: bool,
-        elts: ndarray[uint]
+        elts: ndarray[uint32]
     ) -> None:
         """Set cell value based on corresponding map word index"""
-        map_id = self.get_map_id(x, y)
+        map_id = self._row_base[y] + x
         word_index = map_id >> LOG2_BITS_PER_WORD
         mask = 1 << (map_id & INDEX_MASK)
         tmp = elts[word_index]
@@ -193,17 +382,17 @@ class BitpackedGrid:
         self,
         x: int,
         y: int,
-        elts: ndarray[uint]
+        elts: ndarray[uint32]
     ) -> bool:
         """Get cell value based on corresponding map word index"""
-        map_id = self.get_map_id(x, y)
+        map_id = self._row_base[y] + x
         word_index = map_id >> LOG2_BITS_PER_WORD
         mask = 1 << (map_id & INDEX_MASK)
         return (elts[word_index] & mask) != 0
 
     def get_map_id(self, x: int, y: int) -> int:
         """Get cell index on padded dimensions map"""
-        return (y + PADDING_) * self._map_width + (x + PADDING_)
+        return self._row_base[y] + x
 
     def scan_cells_right(self, x: int, y: int) -> int:
         """Scan cells to the right starting at `p` (x, y)
@@ -221,16 +410,22 @@ class BitpackedGrid:
         mask = ~((1 << start_bit_index) - 1)
         obstacles &= mask
 
-        stop_pos = 0
         start_index = t_index
-        while True:
-            if obstacles != 0:
-                stop_pos = BitpackedGrid.get_number_trailing_zeros(obstacles)
-                break
-
-            t_index += 1
-            obstacles = ~self._map_cells[t_index]
-
+        if obstacles == 0:
+            # find the first word to the right with an obstacle in a single pass;
+            # padding stops the search at most on the first word of the next row
+            row_end = (t_index // self._map_width_in_words + 1) * self._map_width_in_words
+            words = ~self._map_cells[t_index + 1:row_end + 1]
+            nonzero = flatnonzero(words)
+            if nonzero.size == 0:
+                # starting point wrapped past the row padding; search the rest of the grid
+                words = ~self._map_cells[t_index + 1:]
+                nonzero = flatnonzero(words)
+            offset = int(nonzero[0])
+            t_index += offset + 1
+            obstacles = words[offset]
+
+        stop_pos = BitpackedGrid.get_number_trailing_zeros(obstacles)
         retval = (t_index - start_index) * BITS_PER_WORD
         retval += (stop_pos - start_bit_index)
         return x + retval
@@ -255,19 +450,40 @@ class BitpackedGrid:
         mask = mask | (mask - 1)
         obstacles &= mask
 
-        stop_pos = 0
         start_index = t_index
-        while True:
-            if obstacles != 0:
-                stop_pos = BitpackedGrid.get_number_leading_zeros(obstacles)
-                break
-
-            t_index -= 1
-            obstacles = ~self._map_cells[t_index]
-
+        if obstacles == 0:
+            # find the first word to the left with an obstacle in a single pass;
+            # padding stops the search at most on the last word of the previous row
+            row_start = max((t_index // self._map_width_in_words) * self._map_width_in_words - 1, 0)
+            words = ~self._map_cells[row_start:t_index]
+            nonzero = flatnonzero(words)
+            if nonzero.size == 0:
+                # starting point wrapped past the row padding; search the rest of the grid
+                row_start = 0
+                words = ~self._map_cells[:t_index]
+                nonzero = flatnonzero(words)
+            offset = int(nonzero[-1])
+            t_index = row_start + offset
+            obstacles = words[offset]
+
+        stop_pos = BitpackedGrid.get_number_leading_zeros(obstacles)
         retval = (start_index - t_index) * BITS_PER_WORD
         retval += (stop_pos - opposite_index)
         return x - retval
+
+    def get_row_obstacles(self, y: int) -> ndarray[int]:
+        """Return, in increasing order, `x` of every blocked cell of row `y`,
+        padding included
+        """
+        start_word = (self._row_base[y] - PADDING_) >> LOG2_BITS_PER_WORD
+        words = self._map_cells[start_word:start_word + self._map_width_in_words]
+        return flatnonzero(unpackbits(words.view(uint8), bitorder='little') == 0) - PADDING_
+
+    def get_cells_are_traversable_bulk(self, xs: ndarray[int], y: int) -> ndarray[bool]:
+        """Vectorized `get_cell_is_traversable` of many cells of the same row `y`"""
+        obstacles = self.get_row_obstacles(y)
+        index = searchsorted(obstacles, xs).clip(max=obstacles.size - 1)
+        return obstacles[index] != xs
     
     def scan_right(self, x: float, row: int) -> int:
         """Scan right along the lattice from (x, row)
@@ -277,13 +493,10 @@ class BitpackedGrid:
         left_of_x = int(x + self.smallest_step_div2)
         tile_id = self.get_map_id(left_of_x, row)
         t_index = tile_id >> LOG2_BITS_PER_WORD
-        ta_index = t_index - self._map_width_in_words
-
-        # scan adjacent cells from the current row and the row above
-        cells = self._map_cells[t_index]
-        cells_above = self._map_cells[ta_index]
 
-        obstacles = ~cells & ~cells_above
+        # obstacles are points whose adjacent cells from the current row
+        # and the row above are both blocked
+        obstacles = self._travel_blocked[t_index]
         corners = self._corner[t_index]
 
         # ignore corners in bit positions <= (i.e. to the left of) the starting cell
@@ -297,23 +510,28 @@ class BitpackedGrid:
         # (e.g. current location is a double corner)
         obstacles &= ~(mask - 1)
 
-        stop_pos = 0
         start_index = t_index
-        while True:
-            value = corners | obstacles
-            if value != 0:
-                # Each point (x, y) is associated with the top-left 
-                # corner of tile (x, y). When traveling right (cf. left)
-                # we need to stop exactly at the position of the first 
-                # (corner or obstacle) bit. 
-                stop_pos = BitpackedGrid.get_number_trailing_zeros(value)
-                break
-
-            t_index += 1
-            ta_index += 1
-            corners = self._corner[t_index]
-            obstacles = ~self._map_cells[t_index] & ~self._map_cells[ta_index]
-
+        value = corners | obstacles
+        if value == 0:
+            # find the first word to the right with a corner or obstacle in a single pass;
+            # padding stops the search at most on the first word of the next row
+            row_end = (t_index // self._map_width_in_words + 1) * self._map_width_in_words
+            words = (self._corner[t_index + 1:row_end + 1] |
+                     self._travel_blocked[t_index + 1:row_end + 1])
+            nonzero = flatnonzero(words)
+            if nonzero.size == 0:
+                # starting point wrapped past the row padding; search the rest of the grid
+                words = self._corner[t_index + 1:] | self._travel_blocked[t_index + 1:]
+                nonzero = flatnonzero(words)
+            offset = int(nonzero[0])
+            t_index += offset + 1
+            value = words[offset]
+
+        # Each point (x, y) is associated with the top-left 
+        # corner of tile (x, y). When traveling right (cf. left)
+        # we need to stop exactly at the position of the first 
+        # (corner or obstacle) bit. 
+        stop_pos = BitpackedGrid.get_number_trailing_zeros(value)
         retval = left_of_x + ((t_index - start_index) * BITS_PER_WORD + stop_pos)
         retval -= start_bit_index
         return retval
@@ -331,13 +549,10 @@ class BitpackedGrid:
 
         tile_id = self.get_map_id(left_of_x, row)
         t_index = tile_id >> LOG2_BITS_PER_WORD
-        ta_index = t_index - self._map_width_in_words
 
-        # scan adjacent cells from the current row and the row above
-        cells = self._map_cells[t_index]
-        cells_above = self._map_cells[ta_index]
-
-        obstacles = ~cells & ~cells_above
+        # obstacles are points whose adjacent cells from the current row
+        # and the row above are both blocked
+        obstacles = self._travel_blocked[t_index]
         corners = self._corner[t_index]
 
         # ignore cells in bit positions >= (i.e. to the right of) the starting cell
@@ -350,29 +565,33 @@ class BitpackedGrid:
         corners &= mask
         obstacles &= mask
 
-        stop_pos = 0
         start_index = t_index
-        while True:
-            value = corners | obstacles
-            if value != 0:
-                # Each point (x, y) is associated with the top-left 
-                # corner of tile (x, y). When counting zeroes to figure
-                # out how far we can travel we end up stopping one 
-                # position before the first set bit. This approach prevents
-                # us from traveling through an obstacle (we stop right before)
-                # but in in the case of corner tiles, we need to stop exactly 
-                # at the position of the set bit. Hence, +1 below.
-                stop_pos = min(
-                    BitpackedGrid.get_number_leading_zeros(corners) + 1, 
-                    BitpackedGrid.get_number_leading_zeros(obstacles)
-                )
-                break
-
-            t_index -= 1
-            ta_index -= 1
+        if (corners | obstacles) == 0:
+            # find the first word to the left with a corner or obstacle in a single pass;
+            # padding stops the search at most on the last word of the previous row
+            row_start = max((t_index // self._map_width_in_words) * self._map_width_in_words - 1, 0)
+            words = self._corner[row_start:t_index] | self._travel_blocked[row_start:t_index]
+            nonzero = flatnonzero(words)
+            if nonzero.size == 0:
+                # starting point wrapped past the row padding; search the rest of the grid
+                row_start = 0
+                words = self._corner[:t_index] | self._travel_blocked[:t_index]
+                nonzero = flatnonzero(words)
+            t_index = row_start + int(nonzero[-1])
             corners = self._corner[t_index]
-            obstacles = ~self._map_cells[t_index] & ~self._map_cells[ta_index]
-
+            obstacles = self._travel_blocked[t_index]
+
+        # Each point (x, y) is associated with the top-left 
+        # corner of tile (x, y). When counting zeroes to figure
+        # out how far we can travel we end up stopping one 
+        # position before the first set bit. This approach prevents
+        # us from traveling through an obstacle (we stop right before)
+        # but in in the case of corner tiles, we need to stop exactly 
+        # at the position of the set bit. Hence, +1 below.
+        stop_pos = min(
+            BitpackedGrid.get_number_leading_zeros(corners) + 1, 
+            BitpackedGrid.get_number_leading_zeros(obstacles)
+        )
         retval = left_of_x - ((start_index - t_index) * BITS_PER_WORD + stop_pos)
         retval += (BITS_PER_WORD - start_bit_index)
         return retval
@@ -382,26 +601,26 @@ class BitpackedGrid:
         print(f'Loading map: {map_file}')
         
         try:
-            with input(map_file, mode='r') as file:
-                map_type, *dims, map_token = [next(file).strip() for _ in range(4)]
-
-                if map_token != 'map':
-                    raise Exception(f'Could not load map; unrecognized format: {map_token}')
-                if map_token == 'octile':
-                    raise Exception(f'Could not load map; only octile types are supported; got: {map_type}')
-                
-                dims = dict([dim.split() for dim in dims])
-                try:
-                    dims['width'] = int(dims['width'])
-                    dims['height'] = int(dims['height'])
-                except Exception as e:
-                    raise Exception(f'Could not load map; invalid height/width: {e}')
-                
-                self.init(**dims)
-                for y in range(dims['height']):
-                    map_line = next(file)
-                    for x in range(dims['width']):
-                        self.set_cell_is_traversable(x, y, map_line[x] == '.')
+            lines = Path(map_file).read_text().splitlines()
+            map_type, *dims, map_token = [line.strip() for line in lines[:4]]
+
+            if map_token != 'map':
+                raise Exception(f'Could not load map; unrecognized format: {map_token}')
+            if map_token == 'octile':
+                raise Exception(f'Could not load map; only octile types are supported; got: {map_type}')
+            
+            dims = dict([dim.split() for dim in dims])
+            try:
+                dims['width'] = int(dims['width'])
+                dims['height'] = int(dims['height'])
+            except Exception as e:
+                raise Exception(f'Could not load map; invalid height/width: {e}')
+            
+            self.init(**dims)
+            width, height = dims['width'], dims['height']
+            map_lines = ''.join(line[:width] for line in lines[4:4 + height])
+            cells = frombuffer(map_lines.encode('ascii'), dtype=uint8) == ord('.')
+            self.set_cells_are_traversable(cells.reshape(height, width))
             print('Map loaded')
         except Exception as e:
             raise Exception(f'Unexpected exception while loading map file: {e}')
@@ -410,14 +629,17 @@ class BitpackedGrid:
         """Return the number of map cells that are not blocked.
         Although this value does not represent all possible paths
         since there may be problems without solution
-        e.g. cells surrounded by obstacles
+        e.g. cells surrounded by obstacles.
+        Padding cells are never set so counting every set bit suffices
+        """
+        return int(unpackbits(self._map_cells.view(uint8)).sum())
+
+    @staticmethod
+    def pack_bits(bits: ndarray[bool]) -> ndarray[uint32]:
+        """Pack a flat array of bits into words where
+        the leftmost cell is in the lowest bit of each word
         """
-        valid = 0
-        for x in range(self._map_width_original):
-            for y in range(self._map_height_original):
-                if self.get_cell_is_traversable(x, y):
-                    valid += 1
-        return valid
+        return packbits(bits, bitorder='little').view('<u4').astype(uint32)
 
     @staticmethod
     def get_number_trailing_zeros(value: int) -> int:
@@ -427,7 +649,8 @@ class BitpackedGrid:
         """
         if value == 0:
             return 32
-        return len(s := bin(value)) - len(s.rstrip('0'))
+        value = int(value)
+        return (value & -value).bit_length() - 1
 
     @staticmethod
     def get_number_leading_zeros(value: int) -> int:
@@ -1,68 +1,78 @@
-from math import nan
+from math import hypot, inf
 from node import Node
 from vertex import Vertex
-from constants import EPSILON, ROOT_TWO
+from constants import EPSILON, ROOT_TWO, DEBUG
 from point import Point2D
+from jit import njit
 from typing import Optional
 
-# hacky implementation; we infer float and int as Number for method overload
-from numbers import Number
 
-try:
-    from multipledispatch import dispatch
-except ImportError as e:
-    raise Exception('Unable to import multipledispatch, make sure you have it installed')
+@njit(cache=True)
+def anya_h(
+    rootx: float,
+    rooty: float,
+    ileft: float,
+    iright: float,
+    irow: int,
+    targetx: float,
+    targety: float
+) -> float:
+    """Numeric core of the Anya heuristic, see `Heuristic.get_value`.
+    Compiled with Numba when it is available
+    """
+    # mirror the target when it is on the same side of the interval as the root;
+    # kept branchless so the compiled kernel has no data-dependent jump here
+    same_side = (rooty - irow) * (targety - irow) > 0
+    mirrored_targety = targety + same_side * 2 * (irow - targety)
+
+    # project the interval endpoints onto the target row;
+    # flat nodes (root on the interval row) have no projection
+    rise_root_to_irow = abs(rooty - irow)
+    if rise_root_to_irow != 0.0:
+        run_scale = abs(irow - targety) / rise_root_to_irow
+        left_proj = ileft - run_scale * (rootx - ileft)
+        right_proj = iright + run_scale * (iright - rootx)
+
+        if (targetx + EPSILON) < left_proj:
+            return hypot(rootx - ileft, rooty - irow) + hypot(ileft - targetx, irow - mirrored_targety)
+
+        if targetx > (right_proj + EPSILON):
+            return hypot(rootx - iright, rooty - irow) + hypot(iright - targetx, irow - mirrored_targety)
+
+    return hypot(rootx - targetx, rooty - mirrored_targety)
 
 
 class EuclideanDistanceHeuristic:
     """A heuristic for computing Euclidean distances in the plane."""
 
-    @dispatch(Vertex)
-    def get_value(self, n: Vertex) -> float:
-        return 0
-    
-    @dispatch(Vertex, Vertex)
     def get_value(
         self,
         n: Optional[Vertex],
-        t: Optional[Vertex]
+        t: Optional[Vertex] = None
     ) -> float:
         if n is None or t is None:
             return 0
-        return self.h(*n.position, *t.position)
+        return self.h(n.px, n.py, t.px, t.py)
 
     def h(self, x1: float, y1: float, x2: float, y2: float) -> float:
-        return ((x1 - x2) ** 2 + (y1 - y2) ** 2) ** 0.5
+        return hypot(x1 - x2, y1 - y2)
 
 
 class OctileDistanceHeuristic:
     def __init__(self, t: Vertex):
         self.target = t
 
-    @dispatch(Vertex)
-    def get_value(self, s: Vertex) -> float:
-        if self.target is None:
+    def get_value(self, s: Vertex, t: Optional[Vertex] = None) -> float:
+        """Octile distance between `s` and `t`, or the current target if `t` is omitted"""
+        if t is None:
+            t = self.target
+        if s is None or t is None:
             return 0
-        return self.get_value(s, self.target)
-
-    @dispatch(Vertex, Vertex)
-    def get_value(self, s: Vertex, t: Vertex) -> float:
-        if s is None:
-            return 0
-        return self.get_value(int(s.position.x), int(s.position.y),
-                              int(t.position.x), int(t.position.y))
-
-    @dispatch(Number, Number, Number, Number)
-    def get_value(
-        self,
-        x1: Number,
-        y1: Number,
-        x2: Number,
-        y2: Number
-    ) -> float:
-        dx = abs(x1 - x2)
-        dy = abs(y1 - y2)
-        return int(abs(dx - dy)) + min(dx, dy) * ROOT_TWO
+        dx = abs(int(s.px) - int(t.px))
+        dy = abs(int(s.py) - int(t.py))
+        if dx > dy:
+            return (dx - dy) + dy * ROOT_TWO
+        return (dy - dx) + dx * ROOT_TWO
 
 
 class HackyHeuristic:
@@ -70,15 +80,17 @@ class HackyHeuristic:
         self.h = OctileDistanceHeuristic(None)
         self.target: Optional[Point2D] = None
 
-    @dispatch(Point2D)
-    def get_value(self, n: Point2D) -> float:
-        if self.target is None:
-            return 0
-        return self.h.get_value(*n, *self.target)
-
-    @dispatch(Point2D, Point2D)
-    def get_value(self, n: Point2D, t: Point2D) -> float:
-        return self.h.get_value(*n, *t)
+    def get_value(self, n: Point2D, t: Optional[Point2D] = None) -> float:
+        """Octile distance between `n` and `t`, or the current target if `t` is omitted"""
+        if t is None:
+            t = self.target
+            if t is None:
+                return 0
+        dx = abs(n.x - t.x)
+        dy = abs(n.y - t.y)
+        if dx > dy:
+            return (dx - dy) + dy * ROOT_TWO
+        return (dy - dx) + dx * ROOT_TWO
 
 
 class Heuristic:
@@ -92,11 +104,6 @@ class Heuristic:
     both on the same row as the interval. If that condition is not met,
     target node is mirrored on the opposite side.
 
-    Attributes
-    ----------
-    _h : EuclideanDistanceHeuristic
-        Heuristic to compute Euclidean distance between nodes
-
     Examples
     -------
     t = Node(root=(3, 4), interval=(3, 3, 4))
@@ -110,52 +117,34 @@ class Heuristic:
 
     """
 
-    def __init__(self):
-        self._h = EuclideanDistanceHeuristic()
-
-    @dispatch(Node)
-    def get_value(self, n: Node) -> float:
-        return 0
-    
-    @dispatch(Node, Node)
     def get_value(
         self,
         n: Node,
-        t: Node
+        t: Node,
+        g: float = 0.0,
+        prune_bound: float = inf
     ) -> float:
         """Calculate heuristic between `n` and `t`.
         The target node must have an interval that only has its XY point, that means
         interval left == right == target.root.x; and interval row == target.root.y
+
+        When `g` plus the straight-line distance from the root to the target already
+        reaches `prune_bound`, that distance is returned instead of the full heuristic;
+        it is a lower bound of it, so the caller can prune the node either way
         """
-        assert (t.root.y == t.interval.row and
-                t.root.x == t.interval.left and
-                t.root.x == t.interval.right)
-
-        irow = n.interval.row
-        ileft = n.interval.left
-        iright = n.interval.right
-        targetx = t.root.x
-        targety = t.root.y
-        rootx = n.root.x
-        rooty = n.root.y
-
-        if rooty < irow and targety < irow:
-            targety += 2 * (irow - targety)
-        elif rooty > irow and targety > irow:
-            targety -= 2 * (targety - irow)
-
-        # project the interval endpoints onto the target row
-        rise_root_to_irow = abs(n.root.y - n.interval.row)
-        rise_irow_to_target = abs(n.interval.row - t.root.y)
-        lrun = n.root.x - n.interval.left
-        rrun = n.interval.right - n.root.x
-        left_proj = n.interval.left - rise_irow_to_target * (lrun / rise_root_to_irow) if rise_root_to_irow != 0.0 else nan
-        right_proj = n.interval.right + rise_irow_to_target * (rrun / rise_root_to_irow) if rise_root_to_irow != 0.0 else nan
-        
-        if (t.root.x + EPSILON) < left_proj:
-            return self._h.h(rootx, rooty, ileft, irow) + self._h.h(ileft, irow, targetx, targety)
-
-        if t.root.x > (right_proj + EPSILON):
-            return self._h.h(rootx, rooty, iright, irow) + self._h.h(iright, irow, targetx, targety)
-
-        return self._h.h(rootx, rooty, targetx, targety)
+        target = t.root
+        targetx, targety = target.x, target.y
+        if DEBUG:
+            assert (targety == t.interval.row and
+                    targetx == t.interval.left and
+                    targetx == t.interval.right)
+
+        root = n.root
+        if prune_bound < inf:
+            lower_bound = hypot(root.x - targetx, root.y - targety)
+            if g + lower_bound >= prune_bound:
+                return lower_bound
+
+        interval = n.interval
+        return anya_h(root.x, root.y, interval.left, interval.right, interval.row,
+                      targetx, targety)
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from point import Point2D
 from constants import DOUBLE_INEQUALITY_THRESHOLD, EPSILON
+from typing import Dict, Tuple
 
 
 class Interval:
@@ -11,11 +12,11 @@ class Interval:
 
     Attributes
     ----------
-    _left : float
+    left : float
         leftmost point of the interval
-    _right : float
+    right : float
         rightmost point of the interval
-    _row : int
+    row : int
         Y axis denotating which row the interval is projected to
     discrete_left : bool
         Indicates whether or not left point is discrete
@@ -24,53 +25,41 @@ class Interval:
     
     """
 
-    def __init__(self, left: float, right: float, row: int):
-        self.init(left, right, row)
-
-    def init(self, left: float, right: float, row: int) -> None:
-        """Use property setters to assign _left, _right and _row"""
-        self.left = left
-        self.right = right
-        self.row = row
-
-    @property
-    def left(self) -> float:
-        """Get or set left point of interval and whether it's discrete"""
-        return self._left
-
-    @left.setter
-    def left(self, left: float) -> None:
-        self._left = left
+    __slots__ = ('left', 'right', 'row', 'discrete_left', 'discrete_right')
 
+    def __init__(self, left: float, right: float, row: int):
         self.discrete_left = abs(int(left + EPSILON) - left) < EPSILON
-        if self.discrete_left:
-            self._left = int(self._left + EPSILON)
-
-    @property
-    def right(self) -> float:
-        """Get or set right point of interval and whether it's discrete"""
-        return self._right
-
-    @right.setter
-    def right(self, right: float) -> None:
-        self._right = right
+        self.left = int(left + EPSILON) if self.discrete_left else left
 
         self.discrete_right = abs(int(right + EPSILON) - right) < EPSILON
-        if self.discrete_right:
-            self._right = int(self._right + EPSILON)
+        self.right = int(right + EPSILON) if self.discrete_right else right
 
-    @property
-    def row(self) -> int:
-        """Get or set row of interval"""
-        return self._row
+        self.row = row
 
-    @row.setter
-    def row(self, row: int) -> None:
-        self._row = row
+    def init(self, left: float, right: float, row: int) -> None:
+        """Reuse this interval for new endpoints and row"""
+        self.__init__(left, right, row)
+
+    @classmethod
+    def get(
+        cls,
+        left: float,
+        right: float,
+        row: int,
+        interned: Dict[Tuple[float, float, int], Interval]
+    ) -> Interval:
+        """Return the interval of `interned` with the same endpoints and row,
+        creating and adding it on first request. Shared intervals must not be reinitialized
+        """
+        key = (left, right, row)
+        interval = interned.get(key)
+        if interval is None:
+            interval = interned[key] = cls(left, right, row)
+        return interval
 
     def range_size(self) -> float:
         """Get interval size"""
-        return self._right - self._left
+        return self.right - self.left
 
     def covers(self, i: Interval) -> bool:
         """Check if intervals are identical or 
@@ -79,33 +68,36 @@ class Interval:
         if self == i:
             return True
 
-        return self._left <= i.left and self._right >= i.right and self._row == i.row
+        return self.left <= i.left and self.right >= i.right and self.row == i.row
 
     def contains(self, p: Point2D) -> bool:
         """Check if a point is in the interval. 
         row is Y whereas left and right control X
         """
-        return (int(p.y) == self._row and 
-                (p.x + EPSILON) >= self._left and 
-                p.x <= (self._right + EPSILON))
+        if int(p.y) != self.row:
+            return False
+        x = p.x
+        return (x + EPSILON) >= self.left and x <= (self.right + EPSILON)
 
     def __eq__(self, i: Interval) -> bool:
         """Check if all attributes from two intervals are the same"""
-        if not isinstance(i, type(self)):
+        if i is self:
+            return True
+        if type(i) is not Interval:
             return False
 
-        return (abs(i.left - self._left) < DOUBLE_INEQUALITY_THRESHOLD and 
-                abs(i.right - self._right) < DOUBLE_INEQUALITY_THRESHOLD and 
-                i.row == self._row)
+        return (abs(i.left - self.left) < DOUBLE_INEQUALITY_THRESHOLD and 
+                abs(i.right - self.right) < DOUBLE_INEQUALITY_THRESHOLD and 
+                i.row == self.row)
 
     def __hash__(self) -> int:
-        temp = int(self._left)
+        temp = int(self.left)
         result = temp ^ abs(temp >> 32)
-        temp = int(self._right)
+        temp = int(self.right)
         result = 31 * result + (temp ^ abs(temp >> 32))
-        result = 31 * result + self._row
+        result = 31 * result + self.row
         return result
 
     def __repr__(self) -> str:
         """Debug representation of the interval"""
-        return f'Interval ({self._left}, {self._right}, {self._row})'
+        return f'Interval ({self.left}, {self.right}, {self.row})'
@@ -1,13 +1,139 @@
-from grid import BitpackedGrid
+from grid import (BitpackedGrid, word_bit_value, word_scan_cells_left, word_scan_cells_right,
+                  word_scan_left, word_scan_right)
 from node import Node
-
-# hacky implementation; we infer float and int as Number for method overload
-from numbers import Number
+from constants import DEBUG
+from jit import njit
+from typing import Tuple
 
 try:
-    from multipledispatch import dispatch
+    import numpy as np
 except ImportError as e:
-    raise Exception('Unable to import multipledispatch, make sure you have it installed')
+    raise Exception('Unable to import NumPy, make sure you have it installed')
+
+
+@njit(cache=True)
+def project_cone_kernel(
+    ileft: float,
+    iright: float,
+    irow: int,
+    rootx: int,
+    rooty: int,
+    check_vis_row: int,
+    cells: np.ndarray,
+    map_width: int,
+    smallest_step_div2: float
+) -> Tuple[bool, bool, float, float, int, int]:
+    """Numeric core of `IntervalProjection.project_cone` onto `check_vis_row`.
+    Return valid, observable, left, right, max_left and max_right;
+    all but valid are meaningless for invalid projections
+    """
+    if not (word_bit_value(cells, map_width, int(ileft + smallest_step_div2), check_vis_row) and
+            word_bit_value(cells, map_width, int(iright - smallest_step_div2), check_vis_row)):
+        return False, False, 0.0, 0.0, 0, 0
+
+    # interpolate the endpoints of the new interval onto the next row.
+    inv_rise = 1.0 / abs(irow - rooty)
+    lrun = rootx - ileft
+    rrun = iright - rootx
+
+    # clip the interval if visibility from the root is obstructed.
+    # NB: +1 because we convert from tile coordinates to point coords
+    iright_cell = int(iright)
+    max_left = word_scan_cells_left(cells, map_width, int(ileft), check_vis_row) + 1
+    left = max(ileft - lrun * inv_rise, max_left)
+
+    max_right = word_scan_cells_right(cells, map_width, iright_cell, check_vis_row)
+    right = min(iright + rrun * inv_rise, max_right)
+
+    observable = left < right
+
+    # sanity checking; sometimes an interval cannot be projected 
+    # all the way to the next row without first hitting an obstacle.
+    # in these cases we need to reposition the endpoints appropriately.
+    # both cells are always read (two bit tests) so the repositioning
+    # reduces to selects rather than data-dependent branches
+    left_traversable = word_bit_value(cells, map_width, int(ileft - smallest_step_div2), check_vis_row)
+    right_traversable = word_bit_value(cells, map_width, iright_cell, check_vis_row)
+
+    left = (right if left_traversable else max_left) if left >= max_right else left
+    right = (left if right_traversable else max_right) if right <= max_left else right
+
+    return True, observable, left, right, max_left, max_right
+
+
+@njit(cache=True)
+def project_flat_kernel(
+    ileft: float,
+    iright: float,
+    rootx: int,
+    rooty: int,
+    cells: np.ndarray,
+    corners: np.ndarray,
+    travel_blocked: np.ndarray,
+    map_width: int,
+    smallest_step: float,
+    smallest_step_div2: float
+) -> Tuple[float, float, bool, bool]:
+    """Numeric core of `IntervalProjection.project_flat`.
+    Return left, right, deadend and intermediate
+    """
+    if rootx <= ileft:
+        left = iright
+        right = word_scan_right(corners, travel_blocked, map_width, smallest_step_div2, left, rooty)
+        deadend_x = int(right)
+    else:
+        right = ileft
+        left = word_scan_left(corners, travel_blocked, map_width, smallest_step, right, rooty)
+        deadend_x = int(left - smallest_step_div2)
+
+    deadend = not (word_bit_value(cells, map_width, deadend_x, rooty) and
+                   word_bit_value(cells, map_width, deadend_x, rooty - 1))
+    intermediate = (word_bit_value(cells, map_width, int(left), rooty) and
+                    word_bit_value(cells, map_width, int(left), rooty - 1))
+    return left, right, deadend, intermediate
+
+
+@njit(cache=True)
+def project_f2c_kernel(
+    ileft: float,
+    iright: float,
+    irow: int,
+    rootx: int,
+    cells: np.ndarray,
+    map_width: int
+) -> Tuple[bool, bool, float, float]:
+    """Numeric core of `IntervalProjection.project_f2c_interval`.
+    Return valid, whether the projection goes down, left and right;
+    all but valid are meaningless for invalid projections
+    """
+    # look to the right for successors when the root is on the left, else to the left.
+    # recall that each point (x, y) corresponds to the
+    # top-left corner of a tile at location (x, y)
+    if rootx <= ileft:
+        step_cell = int(iright)
+        below_cell = step_cell - 1
+    else:
+        below_cell = int(ileft)
+        step_cell = below_cell - 1
+
+    # can we make a valid turn? valid means 
+    # (i) the path bends around a corner; 
+    # (ii) we do not step through any obstacles or through 
+    # double-corner points.
+    if not (word_bit_value(cells, map_width, step_cell, irow) and
+            word_bit_value(cells, map_width, step_cell, irow - 1)):
+        return False, False, 0.0, 0.0
+
+    # if the tile below is free, we must be going up
+    # else we round the corner and go down
+    going_down = not word_bit_value(cells, map_width, below_cell, irow)
+    check_vis_row = irow if going_down else irow - 1
+
+    if rootx <= ileft:
+        right = word_scan_cells_right(cells, map_width, step_cell, check_vis_row)
+        return True, going_down, float(iright), float(right)
+    left = word_scan_cells_left(cells, map_width, step_cell, check_vis_row) + 1
+    return True, going_down, float(left), float(ileft)
 
 
 class IntervalProjection:
@@ -47,20 +173,29 @@ class IntervalProjection:
 
     """
 
+    __slots__ = ('left', 'right', 'max_left', 'max_right', 'row', 'valid', 'observable',
+                 'sterile_check_row', 'check_vis_row', 'type_iii_check_row', 'deadend', 'intermediate')
+
     def __init__(self):
+        self.left = self.right = 0
+        self.max_left = self.max_right = 0
+        self.row = self.sterile_check_row = self.check_vis_row = self.type_iii_check_row = 0
         self.valid = False
+        self.observable = False
+        self.deadend = False
+        self.intermediate = False
 
-    @dispatch(Node, BitpackedGrid)
     def project(self, node: Node, grid: BitpackedGrid) -> None:
         """Wrapper for projecting node on the grid"""
-        self.project(node.interval.left, node.interval.right, 
-                     int(node.interval.row), int(node.root.x), int(node.root.y), grid)
+        interval = node.interval
+        root = node.root
+        self.project_interval(interval.left, interval.right, 
+                              interval.row, int(root.x), int(root.y), grid)
 
-    @dispatch(Number, Number, int, int, int, BitpackedGrid)
-    def project(
+    def project_interval(
         self,
-        ileft: Number,
-        iright: Number,
+        ileft: float,
+        iright: float,
         irow: int,
         rootx: int,
         rooty: int,
@@ -95,46 +230,26 @@ class IntervalProjection:
             self.sterile_check_row = self.row = irow + 1
             self.type_iii_check_row = irow - 1
         else:
-            assert rooty > irow, \
-                f'Node Y axis must be greater than interval\'s row to project up. Got {rooty} and {irow}'
+            if DEBUG:
+                assert rooty > irow, \
+                    f'Node Y axis must be greater than interval\'s row to project up. Got {rooty} and {irow}'
             
             self.sterile_check_row = irow - 2
             self.row = self.check_vis_row = irow - 1
             self.type_iii_check_row = irow
 
-        self.valid = (grid.get_cell_is_traversable(int(ileft + grid.smallest_step_div2), self.check_vis_row) and 
-                      grid.get_cell_is_traversable(int(iright - grid.smallest_step_div2), self.check_vis_row))
-
+        (self.valid, observable, left, right, max_left, max_right) = project_cone_kernel(
+            ileft, iright, irow, rootx, rooty, self.check_vis_row,
+            grid.map_cells, grid.map_width, grid.smallest_step_div2
+        )
         if not self.valid:
             return
 
-        # interpolate the endpoints of the new interval onto the next row.
-        rise = abs(irow - rooty)
-        lrun = rootx - ileft
-        rrun = iright - rootx 	    	
-
-        # clip the interval if visibility from the root is obstructed.
-        # NB: +1 because we convert from tile coordinates to point coords
-        self.max_left = grid.scan_cells_left(int(ileft), self.check_vis_row) + 1
-        self.left = max(ileft - lrun/rise, self.max_left)   	
-
-        self.max_right = grid.scan_cells_right(int(iright), self.check_vis_row)
-        self.right = min(iright + rrun/rise, self.max_right)
-
-        self.observable = self.left < self.right
-
-        # sanity checking; sometimes an interval cannot be projected 
-        # all the way to the next row without first hitting an obstacle.
-        # in these cases we need to reposition the endpoints appropriately
-        if self.left >= self.max_right:
-            self.left = (self.right
-                         if grid.get_cell_is_traversable(int(ileft - grid.smallest_step_div2), self.check_vis_row)
-                         else self.max_left)
-
-        if self.right <= self.max_left:
-            self.right = (self.left
-                          if grid.get_cell_is_traversable(int(iright), self.check_vis_row)
-                          else self.max_right)
+        self.observable = observable
+        self.left = left
+        self.right = right
+        self.max_left = max_left
+        self.max_right = max_right
 
     def project_flat(
         self, 
@@ -151,100 +266,55 @@ class IntervalProjection:
         corner on the same row as the root.
         If node is on interval's right, do the opposite by scanning to the left
         """
-        if rootx <= ileft:
-            self.left = iright
-            self.right = grid.scan_right(self.left, rooty)
-            self.deadend = not (grid.get_cell_is_traversable(int(self.right), rooty) and 
-                                grid.get_cell_is_traversable(int(self.right), rooty - 1))	
-        else:
-            self.right = ileft
-            self.left = grid.scan_left(self.right, rooty)
-            self.deadend = not (grid.get_cell_is_traversable(int(self.left - grid.smallest_step_div2), rooty) and 
-                                grid.get_cell_is_traversable(int(self.left - grid.smallest_step_div2), rooty - 1))
-
-        self.intermediate = (grid.get_cell_is_traversable(int(self.left), rooty) and 
-                             grid.get_cell_is_traversable(int(self.left), rooty - 1))
+        self.left, self.right, self.deadend, self.intermediate = project_flat_kernel(
+            ileft, iright, rootx, rooty, grid.map_cells, grid.corners, grid.travel_blocked,
+            grid.map_width, grid.smallest_step, grid.smallest_step_div2
+        )
 
         self.row = rooty
         self.valid = self.left != self.right
 
-    @dispatch(Node, BitpackedGrid)
     def project_f2c(self, node: Node, grid: BitpackedGrid) -> None:
         """Wrapper for projecting flat node"""
-        assert node.interval.row == node.root.y, \
-            f'Node interval and root must be on the same row. Got {node.interval.row} and {node.root.y}'
+        interval = node.interval
+        root = node.root
+        if DEBUG:
+            assert interval.row == root.y, \
+                f'Node interval and root must be on the same row. Got {interval.row} and {root.y}'
         
-        self.project_f2c(node.interval.left, node.interval.right, 
-                         int(node.interval.row), int(node.root.x), int(node.root.y), grid)
+        self.project_f2c_interval(interval.left, interval.right, 
+                                  interval.row, int(root.x), int(root.y), grid)
 
-    @dispatch(Number, Number, int, int, int, BitpackedGrid)
-    def project_f2c(
+    def project_f2c_interval(
         self,
-        ileft: Number,
-        iright: Number,
+        ileft: float,
+        iright: float,
         irow: int,
         rootx: int,
         rooty: int,
         grid: BitpackedGrid
     ) -> None:
         """Project through a flat node and onto an adjacent grid row"""
-        # look to the right for successors
-        # recall that each point (x, y) corresponds to the
-        # top-left corner of a tile at location (x, y)
-        if rootx <= ileft:
-            # can we make a valid turn? valid means 
-            # (i) the path bends around a corner; 
-            # (ii) we do not step through any obstacles or through 
-            # double-corner points.
-            can_step = grid.get_cell_is_traversable(int(iright), irow) and \
-                       grid.get_cell_is_traversable(int(iright), irow - 1)
-
-            if not can_step:
-                self.valid = False
-                self.observable = False
-                return
-            
-            # if the tile below is free, we must be going up
-            # else we round the corner and go down
-            if not grid.get_cell_is_traversable(int(iright) - 1, irow):
-                # going down
-                self.sterile_check_row = self.row = irow + 1
-                self.check_vis_row = irow
-            else:
-             	# going up
-                self.row = self.check_vis_row = irow - 1
-                self.sterile_check_row = irow - 2
-            
-            self.left = self.max_left = iright
-            self.right = self.max_right = grid.scan_cells_right(int(self.left), self.check_vis_row)
-
-        else:
-            # look to the left for successors
+        if DEBUG and rootx > ileft:
             assert rootx >= iright, \
                 ('Node X axis must be greater than interval\'s right to find left successors. '
                  f'Got {rootx} and {iright}')
 
-            can_step = grid.get_cell_is_traversable(int(ileft) - 1, irow) and \
-                       grid.get_cell_is_traversable(int(ileft) - 1, irow - 1)
+        valid, going_down, left, right = project_f2c_kernel(
+            ileft, iright, irow, rootx, grid.map_cells, grid.map_width
+        )
+        self.observable = False
+        if not valid:
+            self.valid = False
+            return
 
-            if not can_step:
-                self.valid = False
-                self.observable = False
-                return
-            
-            # if the tiles below are free, we must be going up
-            # else we round the corner and go down		
-            if not grid.get_cell_is_traversable(int(ileft), irow):
-             	# going down
-                self.check_vis_row = irow
-                self.sterile_check_row = self.row = irow + 1
-            
-            else:
-             	# going up
-                self.row = self.check_vis_row = irow - 1
-                self.sterile_check_row = irow - 2	
-            
-            self.right = self.max_right = ileft
-            self.left = self.max_left = grid.scan_cells_left(int(self.right) - 1, self.check_vis_row) + 1
+        if going_down:
+            self.check_vis_row = irow
+            self.sterile_check_row = self.row = irow + 1
+        else:
+            self.row = self.check_vis_row = irow - 1
+            self.sterile_check_row = irow - 2
+
+        self.left = self.max_left = left
+        self.right = self.max_right = right
         self.valid = True
-        self.observable = False
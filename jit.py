@@ -0,0 +1,17 @@
+# optional Numba support: numeric kernels are decorated with `njit` from here.
+# When Numba is installed they are compiled to native code on first call,
+# otherwise the decorator leaves them untouched and they run as plain Python
+
+from typing import Callable
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs) -> Callable:
+        """No-op stand-in for `numba.njit`, usable with or without arguments"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
@@ -13,24 +13,26 @@ class MicroBenchmark:
     def benchmark(self, reps: int) -> int:
         """Run an experiment and record some statistics. 
         Experiments are run repeatedly until the recorded time
+        reaches the resolution of the timer
         """
         if reps <= 0:
             return 0
 
         wall_start = time_ns()
 
-        start = time_ns()
-        for _ in range(reps):
-            self.runnable.run()
-
-        total_time = time_ns() - start
-        self.avg_time = (total_time / 1000.0) / reps  # in microsecs
+        # rerun the experiment, doubling the repetitions, while the total time
+        # is below the guaranteed resolution of the timer (1 millisecond)
+        while True:
+            start = time_ns()
+            for _ in range(reps):
+                self.runnable.run()
 
-        # rerun the experiment if the total time is below the
-        # guaranteed resolution of the timer (1 millisecond)
-        if (total_time / 1000000) == 0:
-            self.benchmark(reps * 2)
+            total_time = time_ns() - start
+            if total_time >= 1000000:
+                break
+            reps *= 2
 
+        self.avg_time = (total_time / 1000.0) / reps  # in microsecs
         return int(((time_ns() - wall_start) / 1000) + 0.5)
 
     def run(self, valid_iteration: bool) -> None:
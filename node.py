@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from math import hypot
 from interval import Interval
 from point import Point2D
 from typing import Optional
@@ -13,12 +14,12 @@ class Node:
 
     Attributes
     ----------
-    _root : Point2D
+    root : Point2D
         Two dimensional point in a space
-    _interval : Interval
+    interval : Interval
         Tuple of continuous and visible points from a discrete row of the grid
-    _parent : Optional[Node]
-        Parent node of current node
+    parent : Optional[Node]
+        Parent node of current node, a parent can be None
     f : float
         Calculated total cost for node
     g : float
@@ -27,19 +28,24 @@ class Node:
 
     """
 
+    __slots__ = ('interval', 'root', 'parent', 'f', 'g')
+
     def __init__(
         self,
         interval: Interval,
         root: Point2D,
         parent: Optional[Node] = None
     ):
-        self._interval = interval
-        self._root = root
-        self._parent = parent
+        self.interval = interval
+        self.root = root
+        self.parent = parent
 
         self.f = 0
-        self.g = (0 if self._parent is None
-                  else self._parent.g + self._parent.root.distance(self._root))
+        if parent is None:
+            self.g = 0
+        else:
+            parent_root = parent.root
+            self.g = parent.g + hypot(parent_root.x - root.x, parent_root.y - root.y)
     
     @classmethod
     def from_points(
@@ -52,46 +58,23 @@ class Node:
         """Create node based on pair of points"""
         return cls(interval, Point2D(rootx, rooty), parent)
 
-    @property
-    def parent(self) -> Optional[Node]:
-        """Get or set parent node of current node, a parent can be None"""
-        return self._parent
-
-    @parent.setter
-    def parent(self, parent: Optional[Node]) -> None:
-        self._parent = parent
-
-    @property
-    def interval(self) -> Interval:
-        """Get or set node interval"""
-        return self._interval
-
-    @interval.setter
-    def interval(self, interval: Interval) -> None:
-        self._interval = interval
-
-    @property
-    def root(self) -> Point2D:
-        """Get or set XY node root"""
-        return self._root
-
-    @root.setter
-    def root(self, root: Point2D) -> None:
-        self._root = root
-
     def __eq__(self, n: Node) -> bool:
         """Check if two nodes are identical, same interval and XY root"""
-        if not isinstance(n, type(self)):
+        if n is self:
+            return True
+        if type(n) is not Node:
             return False
 
-        if not n.interval == self._interval:
-            return False
-        return self._root == n.root
+        root = self.root
+        n_root = n.root
+        return self.interval == n.interval and root.x == n_root.x and root.y == n_root.y
 
     def __hash__(self) -> int:
-        """Hash node attrs so nodes can be compared between themselves"""
-        return super().__hash__()
+        """Hash node attrs so nodes can be compared between themselves,
+        consistently with `__eq__`
+        """
+        return hash((self.interval, self.root))
 
     def __repr__(self) -> str:
         """Debug representation of the node"""
-        return f'root: {self._root}, {self._interval}'
+        return f'root: {self.root}, {self.interval}'
@@ -1,59 +1,55 @@
 from __future__ import annotations
 
+from array import array
 from vertex import Vertex
-from typing import Optional
+from typing import Iterable, List, Optional, Tuple
 
 
 class Path:
     """Describes a path in a graph in terms of its constituent vertices
-    and their associated cumulative cost. i.e. the cost to step from 
-    the start vertex to the current vertex
+    and their associated cumulative cost. i.e. the cost to step from
+    the start vertex to the current vertex.
+    Vertices and costs are kept in two parallel sequences, ordered from
+    the start vertex to the last one
 
     Attributes
     ----------
-    _vertex : Optional[Vertex]
-        Start node vertex
-    _next : Optional[Path]
-        Points to the next path in the graph
-    _prev : Optional[Path]
-        Points to the previous path in the graph
-    _path_cost : Optional[float]
-        Cost between two vertices that compose the path
+    vertices : List[Vertex]
+        Vertices that compose the path
+    costs : array
+        Cumulative cost of each vertex, as doubles
 
     """
 
+    __slots__ = ('vertices', 'costs')
+
     def __init__(
         self,
-        vertex: Optional[Vertex] = None,
-        next: Optional[Path] = None,
-        path_cost: Optional[float] = None
+        vertices: Optional[List[Vertex]] = None,
+        costs: Optional[Iterable[float]] = None
     ):
-        if not vertex and not next and not path_cost:
-            pass # when initializing a new search, there are no attributes for the first node
+        # when initializing a new search, there are no vertices yet
+        self.vertices = [] if vertices is None else vertices
+        self.costs = array('d') if costs is None else array('d', costs)
 
-        self._vertex = vertex
-        self._path_cost = path_cost
-        self._next = next
-        self._prev = None
-        if next is not None:
-            self._next.prev = self
+    def append(self, vertex: Vertex, path_cost: float) -> None:
+        """Add `vertex` at the end of the path"""
+        self.vertices.append(vertex)
+        self.costs.append(path_cost)
 
-    @property
-    def path_cost(self) -> Optional[float]:
-        return self._path_cost
+    def reverse(self) -> None:
+        """Reverse the path in place, e.g. once built from the last vertex back to the start"""
+        self.vertices.reverse()
+        self.costs.reverse()
 
     @property
-    def next(self) -> Optional[Path]:
-        return self._next
+    def path_cost(self) -> Optional[float]:
+        """Cumulative cost of the whole path, None if the path is empty"""
+        return self.costs[-1] if self.costs else None
 
-    @property
-    def prev(self) -> Optional[Path]:
-        return self._prev
-    
-    @prev.setter
-    def prev(self, prev: Path) -> None:
-        self._prev = prev
+    def __len__(self) -> int:
+        return len(self.vertices)
 
-    @property
-    def vertex(self) -> Optional[Vertex]:
-        return self._vertex
+    def __iter__(self) -> Iterable[Tuple[Vertex, float]]:
+        """Iterate over `(vertex, cumulative cost)` pairs from the start vertex"""
+        return zip(self.vertices, self.costs)
@@ -5,15 +5,23 @@ from expansion_policy import ExpansionPolicy
 from micro_benchmark import MicroBenchmark
 from node import Node
 from interval import Interval
-from random import randint
-from collections import defaultdict
-from typing import Tuple
+from typing import Iterator, Tuple
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise Exception('Unable to import numpy, make sure you have it installed')
 
 
 class RandomRunner:
     MAP_DIR = 'maps'
     RESULT_DIR = 'results/random'
     RUN_HEADER = 'id_map;start;target;path_cost;bench_time;run_time;expanded;generated;heapops'
+    # algorithm name -> method running it
+    ALGORITHMS = {'anya': 'run_anya', 'astar': 'run_astar'}
+    # results are written through a large buffer rather than flushed every few lines;
+    # the buffer is still flushed when the run is interrupted
+    WRITE_BUFFER_SIZE = 1 << 20
 
     def run_anya(self, map_file: str) -> None:
         print(f'Running Anya for {map_file}')
@@ -35,26 +43,33 @@ class RandomRunner:
         max_width = grid.map_width_original
         max_height = grid.map_height_original
 
-        point_history = defaultdict(set)
+        # unordered start/target pairs already run (same cost going backwards), each packed
+        # into a single int; a dense bitset over all pairs would not fit in memory
+        n_points = (max_width + 1) * (max_height + 1)
+        pair_history = set()
+
+        # rejection sampling reads cells from a boolean view of the grid, indexed [y, x]
+        xs = np.arange(max_width + 1)
+        traversable = np.array([grid.get_cells_are_traversable_bulk(xs, y)
+                                for y in range(max_height + 1)])
+        points = self.point_stream(max_width, max_height)
         
-        with open(RandomRunner.get_file_path('anya', map_file), 'w') as run_file:
-            print(f'{RandomRunner.RUN_HEADER}', file=run_file)
+        with open(RandomRunner.get_file_path('anya', map_file), 'w',
+                  buffering=RandomRunner.WRITE_BUFFER_SIZE) as run_file:
+            run_file.write(f'{RandomRunner.RUN_HEADER}\n')
 
             while True:
-                start_point = self.randomize_point(max_width, max_height)
-                while not grid.get_cell_is_traversable(*start_point):
-                    start_point = self.randomize_point(max_width, max_height)
+                start_point = next(p for p in points if traversable[p[1], p[0]])
+                target_point = next(p for p in points
+                                    if p != start_point and traversable[p[1], p[0]])
 
-                target_point = self.randomize_point(max_width, max_height)
-                while (start_point == target_point or 
-                    not grid.get_cell_is_traversable(*target_point)):
-                    target_point = self.randomize_point(max_width, max_height)
+                start_id = start_point[0] * (max_height + 1) + start_point[1]
+                target_id = target_point[0] * (max_height + 1) + target_point[1]
+                pair_id = (start_id * n_points + target_id if start_id < target_id
+                           else target_id * n_points + start_id)
 
-                if (start_point not in point_history or 
-                    target_point not in point_history[start_point]):
-                    # add start -> target and target -> start to history (same cost going backwards)
-                    point_history[start_point].add(target_point)
-                    point_history[target_point].add(start_point)
+                if pair_id not in pair_history:
+                    pair_history.add(pair_id)
 
                     start.root.set_location(*start_point)
                     start.interval.init(start_point[0], *start_point)
@@ -68,12 +83,23 @@ class RandomRunner:
                     duration = exp_runner.avg_time + 0.5
 
                     if path_found:
-                        print((f'{map_file.replace(".map", "")};'
-                               f'{start_point};{target_point};{cost};{wallt_micro};'
-                               f'{duration};{anya.expanded};{anya.generated};{anya.heap_ops}'), file=run_file)
+                        run_file.write(f'{map_file.replace(".map", "")};'
+                                       f'{start_point};{target_point};{cost};{wallt_micro};'
+                                       f'{duration};{anya.expanded};{anya.generated};{anya.heap_ops}\n')
      
-    def randomize_point(self, max_width: int, max_height: int) -> Tuple[int, int]:
-        return randint(0, max_width), randint(0, max_height)
+    def point_stream(
+        self,
+        max_width: int,
+        max_height: int,
+        batch_size: int = 1024
+    ) -> Iterator[Tuple[int, int]]:
+        """Endless stream of random points within [0, max_width] x [0, max_height],
+        drawn `batch_size` at a time
+        """
+        rng = np.random.default_rng()
+        high = (max_width + 1, max_height + 1)
+        while True:
+            yield from map(tuple, rng.integers(0, high, size=(batch_size, 2)).tolist())
     
     @staticmethod
     def get_file_path(alg: str, map_file: str) -> str:
@@ -94,7 +120,7 @@ def main():
     args = parser.parse_args()
     runner = RandomRunner()
     try:
-        eval(f'runner.run_{args.algorithm}(args.map_file)')
+        getattr(runner, RandomRunner.ALGORITHMS[args.algorithm])(args.map_file)
     except Exception as e:
         raise Exception(f'Issue while trying to run {args.algorithm}:\n{e}')
 
@@ -1,4 +1,5 @@
-import os
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 from traceback import format_exc
 from argparse import ArgumentParser
 from experiment_loader import ExperimentLoader
@@ -18,14 +19,22 @@ class ScenarioRunner:
     RESULT_DIR = 'results'
     EXP_HEADER = 'exp;path_found;alg;wallt_micro;runt_micro;'+ \
         'expanded;generated;heapops;start;target;gridcost;realcost;map'
+    # algorithm name -> method running it
+    ALGORITHMS = {'anya': 'run_anya', 'astar': 'run_astar'}
+    # results are written through a large buffer rather than flushed every few lines
+    WRITE_BUFFER_SIZE = 1 << 20
+    # experiments handed to a worker process at a time
+    WORKER_CHUNK_SIZE = 64
     
     def __init__(
         self,
         scenario_file_path: str,
-        verbose: bool
+        verbose: bool,
+        workers: int = 1
     ):
         self.scenario = scenario_file_path
         self.verbose = verbose
+        self.workers = workers
     
     def run(self, alg_name: str, model_path: Optional[str]) -> None:
         """Load experiments, run respective algorithm and
@@ -40,11 +49,12 @@ class ScenarioRunner:
             
             map_file = experiments[0].map_file
             file_path = ScenarioRunner.get_file_path(alg_name, map_file, model_path)
-            with open(file_path, 'w') as run_file:
-                print(f'{ScenarioRunner.EXP_HEADER}', file=run_file)
+            with open(file_path, 'w', buffering=ScenarioRunner.WRITE_BUFFER_SIZE) as run_file:
+                run_file.write(f'{ScenarioRunner.EXP_HEADER}\n')
                 
-                for exp_line in eval(f'self.run_{alg_name}(experiments, map_file, model_path)'):
-                    print(exp_line, file=run_file)
+                run_alg = getattr(self, ScenarioRunner.ALGORITHMS[alg_name])
+                for exp_line in run_alg(experiments, map_file, model_path):
+                    run_file.write(f'{exp_line}\n')
         except Exception as e:
             raise Exception(f'Issue while trying to run {alg_name}:\n{e}')
 
@@ -55,7 +65,26 @@ class ScenarioRunner:
         model_path: Optional[str]
     ) -> Iterator[Tuple[str]]:
         print(f'Running Anya for {self.scenario}')
-        
+
+        if self.workers > 1:
+            # experiments are independent; each worker process builds its own search once
+            with ProcessPoolExecutor(max_workers=self.workers,
+                                     initializer=_init_anya_worker,
+                                     initargs=(self, map_file, model_path)) as executor:
+                yield from executor.map(_run_anya_worker, experiments,
+                                        chunksize=ScenarioRunner.WORKER_CHUNK_SIZE)
+            return
+
+        anya, exp_runner = self.anya_context_(map_file, model_path)
+        for exp in experiments:
+            yield ScenarioRunner.run_anya_experiment_(anya, exp_runner, exp)
+
+    def anya_context_(
+        self,
+        map_file: str,
+        model_path: Optional[str]
+    ) -> Tuple[Search, MicroBenchmark]:
+        """Build the Anya search and its benchmark runner for `map_file`"""
         try:
             anya = Search(ExpansionPolicy(f'{self.MAP_DIR}/{map_file}'),
                           model_path=model_path,
@@ -67,27 +96,34 @@ class ScenarioRunner:
             raise Exception(format_exc())
 
         exp_runner = MicroBenchmark(anya)
-        start = Node.from_points(Interval(0, 0, 0), 0, 0)
-        target = Node.from_points(Interval(0, 0, 0), 0, 0)
-
-        anya.mb_start = start
-        anya.mb_target = target
+        anya.mb_start = Node.from_points(Interval(0, 0, 0), 0, 0)
+        anya.mb_target = Node.from_points(Interval(0, 0, 0), 0, 0)
+        return anya, exp_runner
 
-        for exp in experiments:
-            start.root.set_location(exp.start_x, exp.start_y)
-            start.interval.init(exp.start_x, exp.start_x, exp.start_y)
-            
-            target.root.set_location(exp.end_x, exp.end_y)
-            target.interval.init(exp.end_x, exp.end_x, exp.end_y)
-                    
-            wallt_micro = exp_runner.benchmark(1)
-            cost = anya.mb_cost
-            duration = exp_runner.avg_time + 0.5
+    @staticmethod
+    def run_anya_experiment_(
+        anya: Search,
+        exp_runner: MicroBenchmark,
+        exp: Experiment
+    ) -> str:
+        """Benchmark `anya` on a single experiment and return its result line"""
+        start = anya.mb_start
+        target = anya.mb_target
+
+        start.root.set_location(exp.start_x, exp.start_y)
+        start.interval.init(exp.start_x, exp.start_x, exp.start_y)
+        
+        target.root.set_location(exp.end_x, exp.end_y)
+        target.interval.init(exp.end_x, exp.end_x, exp.end_y)
+                
+        wallt_micro = exp_runner.benchmark(1)
+        cost = anya.mb_cost
+        duration = exp_runner.avg_time + 0.5
 
-            yield (f'{exp.title};{anya.path_found};AnyaSearch;{wallt_micro};{duration};'
-                   f'{anya.expanded};{anya.generated};{anya.heap_ops};'
-                   f'({exp.start_x},{exp.start_y});({exp.end_x},{exp.end_y});'
-                   f'{exp.upper_bound};{cost};{exp.map_file}')
+        return (f'{exp.title};{anya.path_found};AnyaSearch;{wallt_micro};{duration};'
+                f'{anya.expanded};{anya.generated};{anya.heap_ops};'
+                f'({exp.start_x},{exp.start_y});({exp.end_x},{exp.end_y});'
+                f'{exp.upper_bound};{cost};{exp.map_file}')
 
     def run_astar(
         self,
@@ -137,18 +173,30 @@ class ScenarioRunner:
 
         if model_path is not None:
             path = ScenarioRunner.create_dirs_if_missing(model_path)
-            f_path = f'{path}\\{f_name}'
+            f_path = Path(path) / f_name
         else:
-            f_path = f'{ScenarioRunner.RESULT_DIR}\\{f_name}'
-        return f_path
+            f_path = Path(ScenarioRunner.RESULT_DIR) / f_name
+        return str(f_path)
     
     @staticmethod
     def create_dirs_if_missing(model_path: str) -> str:
-        path = os.path.abspath(model_path).split('\\')[-3:-1]
-        path = '{}\\{}\\{}'.format(ScenarioRunner.RESULT_DIR, *path)
-        if not os.path.exists(path):
-            os.makedirs(path)
-        return path
+        model_dir = Path(model_path).resolve().parent
+        path = Path(ScenarioRunner.RESULT_DIR) / model_dir.parent.name / model_dir.name
+        path.mkdir(parents=True, exist_ok=True)
+        return str(path)
+
+
+# search and benchmark runner of a worker process, see `ScenarioRunner.run_anya`
+_worker_context: Optional[Tuple[Search, MicroBenchmark]] = None
+
+
+def _init_anya_worker(runner: ScenarioRunner, map_file: str, model_path: Optional[str]) -> None:
+    global _worker_context
+    _worker_context = runner.anya_context_(map_file, model_path)
+
+
+def _run_anya_worker(exp: Experiment) -> str:
+    return ScenarioRunner.run_anya_experiment_(*_worker_context, exp)
 
 
 def main():
@@ -169,9 +217,15 @@ def main():
     
     parser.add_argument('-m_path', '--model_path',
                         help='Path for trained model for the algorithm to compute paths')
+
+    parser.add_argument('-j', '--workers',
+                        type=int,
+                        default=1,
+                        help=('Number of processes running Anya experiments in parallel; '
+                              'timings are only comparable between runs with the same value'))
     
     args = parser.parse_args()
-    runner = ScenarioRunner(args.scenario, args.verbose)
+    runner = ScenarioRunner(args.scenario, args.verbose, args.workers)
     runner.run(args.algorithm, args.model_path)
 
 
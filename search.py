@@ -1,11 +1,12 @@
 from expansion_policy import ExpansionPolicy
 from node import Node
-from fibonacci_heap import FibonacciHeap
+from binary_heap import BinaryHeap
 from fibonacci_heap_node import FibonacciHeapNode
 from path import Path
 from constants import EPSILON
-from ai import _load_model, predict
-from typing import Dict, Optional
+from math import inf
+from ai import _load_model, predict, predict_batch
+from typing import Dict, List, Optional, Tuple
 
 
 class SearchNode(FibonacciHeapNode):
@@ -20,23 +21,30 @@ class SearchNode(FibonacciHeapNode):
         Tracks if the node has been added to open_list
     closed : bool
         Tracks if the node has been expanded
+    root_hash : int
+        Expander hash of the root of `data`, -1 until the search sets it
 
     """
 
-    def __init__(self, vertex: Node):
+    __slots__ = ('search_id', 'closed', 'root_hash')
+
+    def __init__(self, vertex: Node, search_id: int = -1):
         super().__init__(vertex)
-        self.search_id = -1
+        self.search_id = search_id
+        self.closed = False
+        self.root_hash = -1
 
-    def reset_(self, search_id_counter: int) -> None:
-        """Reset search node attrs"""
-        self.parent = None
-        self.search_id = search_id_counter
+    def init(self, vertex: Node, search_id: int = -1) -> None:
+        """Reuse this search node for `vertex`, as if it was just created"""
+        self.data = vertex
+        self.reset()
+        self.search_id = search_id
         self.closed = False
-        super().reset()
+        self.root_hash = -1
 
     def __repr__(self) -> str:
         """Debug representation of the search node"""
-        return f'({self.data.x}, {self.data.y})'
+        return repr(self.data)
 
 
 class Search:
@@ -51,8 +59,11 @@ class Search:
         Policy to expand nodes and generate their successors
     _heuristic : Heuristic
         Heuristic to evaluate movement costs from a given node to another
-    roots_ : Dict[int, self.SearchNode]
-        Tracks if the node has been expanded. Helps to avoid root-level redundancy
+    roots_ : List[Optional[SearchNode]]
+        Best search node of each root by the expander's root hash, which is dense
+        over the grid cells. Helps to avoid root-level redundancy
+    search_id_counter : int
+        Id of the current search, stamped on the search nodes it inserts
     expanded : int
         Tracks how many nodes were expanded
     insertions : int
@@ -61,7 +72,7 @@ class Search:
         Tracks how many neighbors were generated during the search
     heap_ops : int
         Counts operations in the heap structure
-    open : FibonacciHeap
+    open : BinaryHeap
         Priority queue where unexpanded search nodes are stored ordered by their f value
     mb_start : Node
         Start node
@@ -71,14 +82,28 @@ class Search:
         Cost between start and target nodes
     path_found : bool
         Flag indicating whether or not path was found
+    goal_node_ : Optional[SearchNode]
+        Search node whose interval contains the target, None if no path was found;
+        only valid until the next search reuses the pooled search nodes
+    prune_bound_ : float
+        f-value from which nodes are no longer inserted into the open list, because
+        a node already in it reaches the target at a lower cost
     model : Optional[Sequential]
-        Trained DNN model to compute distance between nodes
+        Trained DNN model to compute distance between nodes, None to use the heuristic instead
     id_map : Optional[str]
         Map name to be used for DNN computations
+    h_values_ : Dict[Tuple[int, float, float, int], float]
+        Heuristic values of the current search by root hash, interval endpoints and row
+    predictions_ : Dict[Tuple[float, float], float]
+        DNN predictions of the current search by root coordinates; the target is fixed
+        during a search and, unlike the geometric heuristic, the model ignores intervals
+    _pool : List[SearchNode]
+        Search nodes created so far, reused by later searches
+    _pool_hi : int
+        Number of pooled search nodes handed out in the current search
 
     """
 
-    search_id_counter = 0
     VERBOSE = False
 
     def __init__(
@@ -87,49 +112,65 @@ class Search:
         model_path: Optional[str] = None,
         id_map: Optional[str] = None
     ):
-        self.roots_: Dict[int, SearchNode] = {}
-        self.open = FibonacciHeap()
+        self.roots_: List[Optional[SearchNode]] = [None] * expander.grid.num_cells
+        self.search_id_counter = 0
+        self.open = BinaryHeap()
+        self._pool: List[SearchNode] = []
+        self.h_values_: Dict[Tuple[int, float, float, int], float] = {}
+        self.predictions_: Dict[Tuple[float, float], float] = {}
+        self._pool_hi = 0
         self._heuristic = expander.heuristic
         self._expander = expander
         self.mb_start = None
         self.mb_target = None
-        if model_path is not None:
-            self.model = _load_model(model_path)
-            self.id_map = id_map
+        self.model = _load_model(model_path) if model_path is not None else None
+        self.id_map = id_map
 
     def init(self) -> None:
         """Initialize open, closed and counters for a new search"""
-        Search.search_id_counter += 1
+        self.search_id_counter += 1
         self.expanded = 0
         self.insertions = 0
         self.generated = 0
         self.heap_ops = 0
         self.open.clear()
-        self.roots_.clear()
+        # only roots of the search nodes handed out in the previous search were set
+        roots = self.roots_
+        for node in self._pool[:self._pool_hi]:
+            roots[node.root_hash] = None
         self.path_found = False
+        self.goal_node_ = None
+        self.prune_bound_ = inf
+        self.h_values_.clear()
+        self.predictions_.clear()
+        # search nodes of the previous search are no longer referenced
+        self._pool_hi = 0
 
     def print_path(self, current: SearchNode) -> None:
         """Get path starting from the first search node that is a parent
         to the last node before target
         """
-        if current.parent is not None:
-            self.print_path(current.parent)
-        print(f'{current.data.root}; g={current.secondary_key}')
+        nodes = []
+        while current is not None:
+            nodes.append(current)
+            current = current.parent
+        for node in reversed(nodes):
+            print(f'{node.data.root}; g={node.secondary_key}')
 
     def search(self, start: Node, target: Node) -> Path:
         """Perform search from `start` to `target` if there's a solution.
         First compute path cost only and generate path going backwards on nodes
         """
         cost = self.search_costonly(start, target)
-        # generate the path
+        # generate the path, walking back from the node that reached the target
         path = Path()
         if cost != -1:
-            node = self.generate(target)
-            while True:
-                path = Path(node.data, path, node.secondary_key)
-                if node.parent is None:
-                    break
+            path.append(target, cost)
+            node = self.goal_node_
+            while node is not None:
+                path.append(node.data, node.secondary_key)
                 node = node.parent
+            path.reverse()
         return path
 
     def search_costonly(self, start: Node, target: Node) -> float:
@@ -144,46 +185,89 @@ class Search:
         if not self._expander.validate_instance(start, target):
             return cost
 
-        start_node = self.generate(start)
-        start_node.reset_(Search.search_id_counter)
+        # freshly handed out search nodes are already reset for this search
+        start_node = self.generate(start, self.search_id_counter)
+        start_node.root_hash = self._expander.hash(start)
 
-        if hasattr(self, 'model'):
+        # resolved once; the model doesn't change during a search
+        use_model = self.model is not None
+        if use_model:
             value = predict(self.model, self.id_map, *start.root, *target.root)
+            self.predictions_[(start.root.x, start.root.y)] = value
         else:
             value = self._heuristic.get_value(start, target)
         self.open.insert(start_node, value, 0)
 
-        while not self.open.is_empty():
-            current: SearchNode = self.open.remove_min()
+        # bind everything the loop touches per node to locals;
+        # counters are written back once the search is over
+        verbose = self.VERBOSE
+        search_id = self.search_id_counter
+        target_root = target.root
+        open_list = self.open
+        open_insert = open_list.insert
+        open_remove_min = open_list.remove_min
+        roots = self.roots_
+        expander = self._expander
+        expander_expand = expander.expand
+        expander_has_next = expander.has_next
+        expander_next = expander.next
+        expander_hash = expander.hash
+        expander_step_cost = expander.step_cost
+        get_value = self._heuristic.get_value
+        new_node = self.new_node_
+        prune_bound = self.prune_bound_
+        h_values = self.h_values_
+        h_values_get = h_values.get
+        predicted = self.predictions_
+        prune_slack = 1 / FibonacciHeapNode.BIG_ONE + EPSILON
+        expanded = heap_ops = insertions = generated = 0
+
+        while not open_list.is_empty():
+            current: SearchNode = open_remove_min()
             
-            if self.VERBOSE:
+            if verbose:
                 print(f'expanding (f={current.key}) {current}')
 
-            self._expander.expand(current.data)
-            self.expanded += 1
-            self.heap_ops += 1
+            expander_expand(current.data)
+            expanded += 1
+            heap_ops += 1
 
-            if current.data.interval.contains(target.root):
+            if current.data.interval.contains(target_root):
                 # found the goal
                 cost = current.key
                 self.path_found = True
+                self.goal_node_ = current
 
-                if self.VERBOSE:
+                if verbose:
                     self.print_path(current)
                 break
 
             # unique id for the root of the parent node
-            p_hash = self._expander.hash(current.data)
+            p_hash = current.root_hash
+            current_g = current.secondary_key
+
+            if use_model:
+                # predictions only depend on the root, and successors mostly share a few roots;
+                # one model call for all roots not predicted yet in this search
+                roots_xy = [(succ.root.x, succ.root.y) for succ in expander.successors]
+                missing = [root_xy for root_xy in set(roots_xy) if root_xy not in predicted]
+                if missing:
+                    predicted.update(zip(missing, predict_batch(self.model, self.id_map,
+                                                                [(*root_xy, *target_root)
+                                                                 for root_xy in missing])))
+                predictions = [predicted[root_xy] for root_xy in roots_xy]
 
             # iterate over all neighbours
-            while self._expander.has_next():
-                succ = self._expander.next()
-                neighbour = self.generate(succ)
+            succ_index = -1
+            while expander_has_next():
+                succ = expander_next()
+                succ_index += 1
+                generated += 1
 
                 insert = True
-                root_hash = self._expander.hash(succ)
-                root_rep = self.roots_.get(root_hash, None)
-                new_g_value = current.secondary_key + self._expander.step_cost()
+                root_hash = expander_hash(succ)
+                root_rep = roots[root_hash]
+                new_g_value = current_g + expander_step_cost()
 
                 """Root level pruning:
                 We prune a node if its g-value is larger than the best
@@ -199,54 +283,89 @@ class Search:
                     while updating its g-value in the root history.
                     If it doesn't, we discard the node
                     """
-                    root_best_g = root_rep.secondary_key
-                    insert = (new_g_value - root_best_g) <= EPSILON
-                    eq = (new_g_value - root_best_g) >= -EPSILON
-                    if insert and eq and root_rep.parent is not None:
-                        p_rep_hash = self._expander.hash(root_rep.parent.data)
+                    g_diff = new_g_value - root_rep.secondary_key
+                    insert = g_diff <= EPSILON
+                    # on a tie (|g_diff| <= EPSILON), only siblings or children of the best node
+                    if insert and g_diff >= -EPSILON and root_rep.parent is not None:
+                        p_rep_hash = root_rep.parent.root_hash
                         insert = (root_hash == p_hash) or (p_rep_hash == p_hash)
 
                 if insert:
                     """Neighbor not found in the root history,
-                    which means it must be inserted. Reset its 
-                    search counter, add current node being expanded
-                    as its parent and add to open and to root history
+                    which means it must be inserted. Only now create its
+                    search node, reset its search counter, add current node
+                    being expanded as its parent and add to open and to root history
                     """
-                    neighbour.reset_(Search.search_id_counter)
-                    neighbour.parent = current
-                    
-                    if hasattr(self, 'model'):
-                        value = predict(self.model, self.id_map,
-                                        *neighbour.data.root, *target.root)
+                    if use_model:
+                        value = predictions[succ_index]
                     else:
-                        value = self._heuristic.get_value(neighbour.data, target)
-
-                    self.open.insert(
+                        # a root reached again on a better path regenerates the same successors
+                        interval = succ.interval
+                        h_key = (root_hash, interval.left, interval.right, interval.row)
+                        value = h_values_get(h_key)
+                        if value is None:
+                            value = get_value(succ, target, new_g_value, prune_bound)
+                        if new_g_value + value >= prune_bound:
+                            # would only be popped after the node reaching the target;
+                            # `value` may only be a lower bound here, so it isn't kept
+                            if verbose:
+                                print(f'\tpruning with f>={new_g_value + value} {succ}')
+                            continue
+                        h_values[h_key] = value
+
+                        if interval.contains(target_root):
+                            # the heuristic is exact here; stay one key step above
+                            # the heap resolution so ties are still expanded as before
+                            prune_bound = min(prune_bound, new_g_value + value + prune_slack)
+
+                    neighbour = new_node(succ, search_id)
+                    neighbour.parent = current
+                    neighbour.root_hash = root_hash
+                    open_insert(
                         neighbour,
                         new_g_value + value,
                         new_g_value
                     )
-                    self.roots_[root_hash] = neighbour
+                    roots[root_hash] = neighbour
 
-                    if self.VERBOSE:
+                    if verbose:
                         print(f'\tinserting with f={neighbour.key} (g={new_g_value}) {neighbour}')
 
-                    self.heap_ops += 1
-                    self.insertions += 1
+                    heap_ops += 1
+                    insertions += 1
 
                 else:
-                    if self.VERBOSE:
+                    if verbose:
                         print(f'\told rootg: {root_rep.secondary_key}')
-                        print(f'\tNOT inserting with f={neighbour.key} (g={new_g_value}) {neighbour}')
+                        print(f'\tNOT inserting with g={new_g_value} {succ}')
+
+        self.expanded = expanded
+        self.generated += generated
+        self.heap_ops = heap_ops
+        self.insertions = insertions
+        self.prune_bound_ = prune_bound
 
         if self.VERBOSE:
             print('finishing search;')
         return cost
 
-    def generate(self, v: Node) -> SearchNode:
+    def generate(self, v: Node, search_id: int = -1) -> SearchNode:
         """Generate a new search node that acts as Fibonacci heap node under the hood"""
-        retval = SearchNode(v)
         self.generated += 1
+        return self.new_node_(v, search_id)
+
+    def new_node_(self, v: Node, search_id: int = -1) -> SearchNode:
+        """Get a search node for `v`, stamped with `search_id`, without counting it as generated.
+        Search nodes left over from previous searches are reused before creating new ones
+        """
+        pool = self._pool
+        if self._pool_hi < len(pool):
+            retval = pool[self._pool_hi]
+            retval.init(v, search_id)
+        else:
+            retval = SearchNode(v, search_id)
+            pool.append(retval)
+        self._pool_hi += 1
         return retval
 
     def run(self) -> None:
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from enum import Enum, auto
+from enum import IntEnum
 from point import Point2D
 
 
@@ -12,8 +12,10 @@ class Vertex:
     ----------
     id : int
         Vertex identification
-    position : Point2D
-        Discrete XY position of the vertex
+    px : float
+        Discrete X position of the vertex
+    py : float
+        Discrete Y position of the vertex
     cell_directions : Enum
         All possible directions from a cell
     vertex_directions : Enum
@@ -21,32 +23,46 @@ class Vertex:
 
     """
 
+    __slots__ = ('id', 'px', 'py')
+
     def __init__(self, id: int, position: Point2D):
         self.id = id
-        self.position = position
+        self.px = position.x
+        self.py = position.y
+
+    @property
+    def position(self) -> Point2D:
+        """Discrete XY position of the vertex, as a new point"""
+        return Point2D(self.px, self.py)
 
     def __eq__(self, v: Vertex) -> bool:
        """Check if two vertices have same id"""
+       if v is self:
+           return True
+       if type(v) is not Vertex:
+           return NotImplemented
        return self.id == v.id
     
     def __hash__(self) -> int:
-        """Hash vertex attrs so vertices can be compared between themselves"""
-        return super().__hash__()
+        """Hash the vertex id, consistently with `__eq__`"""
+        return self.id
 
     def __repr__(self) -> str:
         """Debug representation of the vertex"""
-        return f'Vertex(id: {self.id}, pos: {self.position}'
+        return f'Vertex(id: {self.id}, pos: ({self.px}, {self.py}))'
 
 
-class CellDirections(Enum):
-    CD_LEFTDOWN = auto()
-    CD_LEFTUP = auto()
-    CD_RIGHTDOWN = auto()
-    CD_RIGHTUP = auto()
+class CellDirections(IntEnum):
+    """Cells around a vertex; 0-based so a direction can index a table"""
+    CD_LEFTDOWN = 0
+    CD_LEFTUP = 1
+    CD_RIGHTDOWN = 2
+    CD_RIGHTUP = 3
 
 
-class VertexDirections(Enum):
-    VD_LEFT = auto()
-    VD_RIGHT = auto()
-    VD_DOWN = auto()
-    VD_UP = auto()
+class VertexDirections(IntEnum):
+    """Vertices next to a vertex; 0-based so a direction can index a table"""
+    VD_LEFT = 0
+    VD_RIGHT = 1
+    VD_DOWN = 2
+    VD_UP = 3